@@ -4,7 +4,7 @@ set -e
 cd /root/projects/PropertyScraper/prj_venv/bin
 source activate
 
-cd /root/projects/PropertyScraper/src/01_extract_linux-64
+cd /root/projects/PropertyScraper/src/01_extract
 python3 extract.py
 
 cd /root/projects/PropertyScraper/src/02_transform
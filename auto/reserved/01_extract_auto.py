@@ -39,7 +39,7 @@ def job():
         for csv_file in csv_files:
             os.remove(csv_file)
         os.chdir(extract_dir)
-        runpy.run_path(script_file)  # Run the script
+        runpy.run_path(script_file, run_name="__main__")  # extract.py only runs its main block as __main__
         logging.info("Web scraping script has been initiated.")
     except Exception as e:
         logging.error(f"An error occurred: {e}")
@@ -33,7 +33,7 @@ def job():
         # Run the script using the full path to the Python executable
         # Modify the path to python.exe as per your environment
         os.chdir(transform_dir)
-        runpy.run_path(script_file)
+        runpy.run_path(script_file, run_name="__main__")  # transform.py only runs its main block as __main__
         logging.info("Transformation script has been initiated.")
     except Exception as e:
         logging.error(f"An error occurred: {e}")
@@ -0,0 +1,227 @@
+import argparse, glob, json, os, subprocess, sys, time, pathlib
+from dotenv import load_dotenv
+
+# Compare extraction backends on the saved pages in fixtures/ without touching the live site.
+#   python benchmark.py                      # lxml vs embedded page state vs replayed XHR responses
+#   python benchmark.py --browser            # lxml vs find_element (needs CHROME_DRIVER in .env)
+#   python benchmark.py --suite [--browser]  # whole Extraction runs against fixture_server.py, one per backend
+#   python benchmark.py --suite --save bench.json, later --baseline bench.json to flag throughput regressions
+parser = argparse.ArgumentParser(description="Benchmark extraction backends on fixture pages")
+parser.add_argument("--fixtures", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures"))
+parser.add_argument("--rounds", type=int, default=5)
+parser.add_argument("--browser", action="store_true", help="also time the live find_element path in Chrome")
+parser.add_argument("--suite", action="store_true", help="end-to-end runs of every backend against the fixture server")
+parser.add_argument("--pages", type=int, default=30, help="pages the fixture server paginates through (--suite)")
+parser.add_argument("--latency", type=float, default=0.0, help="milliseconds the fixture server adds per page (--suite)")
+parser.add_argument("--save", help="write the suite results to this JSON file")
+parser.add_argument("--baseline", help="compare the suite results with this JSON file, exit 1 when a backend is 20%% slower")
+parser.add_argument("--run-backend", help=argparse.SUPPRESS)  # one suite run, in its own process
+args = parser.parse_args()
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from modules.mapping import Mapping, ListingContext
+
+pages = sorted(glob.glob(os.path.join(args.fixtures, "*.html")))
+if not pages:
+    sys.exit(f"No fixture pages found in {args.fixtures}")
+
+def report(name, seconds, listings, total_pages=None):
+    total_pages = total_pages or len(pages) * args.rounds
+    print(f"{name:<14} {total_pages:>6} pages {listings:>7} listings {seconds:>9.3f} s "
+          f"{total_pages / seconds:>9.1f} pages/s {listings / seconds:>10.1f} listings/s")
+
+def bench_lxml():
+    sources = [(pathlib.Path(page).read_text(encoding="utf-8"), pathlib.Path(page).as_uri()) for page in pages]
+    listings = 0
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for page_source, url in sources:
+            listings += len([Mapping.map_raw_fields(raw) for raw in Mapping.parse_page_source(page_source, url)])
+    report("lxml", time.perf_counter() - start, listings)
+
+def bench_state():
+    # Pages without an embedded state blob go through the XPath fallback, so both are counted
+    sources = [(pathlib.Path(page).read_text(encoding="utf-8"), pathlib.Path(page).as_uri()) for page in pages]
+    with_state = sum(Mapping.find_page_state(page_source) is not None for page_source, _ in sources)
+    listings = 0
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for page_source, url in sources:
+            listings += len([Mapping.map_raw_fields(raw) for raw in Mapping.parse_page_state(page_source, url)])
+    report("state", time.perf_counter() - start, listings)
+    print(f"{'':<14} {with_state} of {len(sources)} fixture pages carry embedded state, the rest fell back to lxml")
+
+    # Same pages, blob pages only: the fast path on its own
+    state_sources = [(page_source, url) for page_source, url in sources if Mapping.find_page_state(page_source) is not None]
+    for name, parse in (("lxml (state)", Mapping.parse_page_source), ("state only", Mapping.parse_page_state)):
+        listings = 0
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            for page_source, url in state_sources:
+                listings += len([Mapping.map_raw_fields(raw) for raw in parse(page_source, url)])
+        report(name, time.perf_counter() - start, listings, len(state_sources) * args.rounds)
+
+def bench_xhr():
+    # Replays recorded performance logs (fixtures/*_xhr_*.json) through the same code the 'xhr' mode runs
+    from modules.replay import ReplayDriver
+    from modules.setup import Setup
+
+    recordings = sorted(glob.glob(os.path.join(args.fixtures, "*_xhr_*.json")))
+    if not recordings:
+        return
+    listings, webdriver_calls = 0, 0
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for recording in recordings:
+            driver = ReplayDriver(recording)
+            bodies = Setup.listing_responses(driver, r'graphql|/api/|listing')
+            listings += len([Mapping.map_raw_fields(raw) for raw in Mapping.parse_listing_responses(bodies, driver.current_url)])
+            webdriver_calls += driver.webdriver_calls
+    report("xhr replay", time.perf_counter() - start, listings, len(recordings) * args.rounds)
+    print(f"{'':<14} {webdriver_calls / listings:.2f} WebDriver calls per listing")
+
+def bench_browser():
+    from selenium.webdriver.common.by import By
+    from modules.setup import Setup
+
+    load_dotenv(os.path.join(os.getcwd(), '../../.env'))
+    chrome_driver_file = os.path.join(os.getenv("MAIN_DIR"), os.getenv("CONFIG_DIR"), os.getenv("CHROME_DRIVER"))
+    driver = Setup.instantiate_browser(chrome_driver_file, Setup.setup_driver())
+    extractors = {
+        "Page_Link": Mapping.extract_page_link,
+        "Source": Mapping.extract_source,
+        "Agent_Name": lambda listing: Mapping.extract_element_text(listing, Mapping.AGENT_NAME_XPATH),
+        "Posted_Date": lambda listing: Mapping.extract_element_text(listing, Mapping.POSTED_DATE_XPATH),
+        "House_Price": lambda listing: Mapping.extract_element_text(listing, Mapping.HOUSE_PRICE_XPATH),
+        "Price_Square_Feet": Mapping.extract_price_square_feet,
+        "House_Name": lambda listing: Mapping.extract_element_text(listing, Mapping.HOUSE_NAME_XPATH),
+        "House_Location": lambda listing: Mapping.extract_element_text(listing, Mapping.HOUSE_LOCATION_XPATH),
+        "House_Type": Mapping.extract_house_type,
+        "Lot_Type": Mapping.extract_lot_type,
+        "Square_Footage": Mapping.extract_square_footage,
+        "House_Furniture": Mapping.extract_house_furniture,
+    }
+    try:
+        timings = {"find_element": [0.0, 0], "lxml+source": [0.0, 0]}
+        for _ in range(args.rounds):
+            for page in pages:
+                driver.get(pathlib.Path(page).as_uri())
+
+                start = time.perf_counter()
+                for listing in driver.find_elements(By.XPATH, Mapping.LISTING_XPATH):
+                    listing = ListingContext(listing)
+                    {key: extract(listing) for key, extract in extractors.items()}
+                    timings["find_element"][1] += 1
+                timings["find_element"][0] += time.perf_counter() - start
+
+                start = time.perf_counter()
+                rows = Mapping.parse_page_source(driver.page_source, driver.current_url)
+                timings["lxml+source"][1] += len([Mapping.map_raw_fields(raw) for raw in rows])
+                timings["lxml+source"][0] += time.perf_counter() - start
+        for name, (seconds, listings) in timings.items():
+            report(name, seconds, listings)
+    finally:
+        driver.quit()
+
+# name -> (environment of the run, needs Chrome)
+SUITE_BACKENDS = {
+    "http": ({"FETCH_ENGINE": "http", "EXTRACT_MODE": "state"}, False),
+    "element": ({"EXTRACT_MODE": "element"}, True),
+    "harvest": ({"EXTRACT_MODE": "harvest"}, True),
+    "lxml": ({"EXTRACT_MODE": "lxml"}, True),
+    "state": ({"EXTRACT_MODE": "state"}, True),
+    "lxml-url-tabs": ({"EXTRACT_MODE": "lxml", "PAGINATION_MODE": "url", "TAB_DEPTH": "3"}, True),
+}
+
+def run_backend(name):
+    """One region scraped end to end from the fixture server; prints its measurements as a JSON line."""
+    import tempfile, threading, psutil
+    import fixture_server
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+    load_dotenv(os.path.join(os.getcwd(), '../../.env'))  # chromedriver and Chrome locations for the browser backends
+    server = fixture_server.serve(0, pages=args.pages, latency=args.latency / 1000)
+    os.environ.setdefault("CHROME_DRIVER", "chromedriver")  # only read, never started, by the http backend
+    os.environ.update(
+        SUITE_BACKENDS[name][0],
+        CONFIG_DIR=os.path.join(os.getenv("MAIN_DIR", ""), os.getenv("CONFIG_DIR", "")),  # stays put when MAIN_DIR moves
+        MAIN_DIR=tempfile.mkdtemp(prefix="benchmark_"), RAW_DIR="raw", LOG_DIR="logs", BROWSER_MAX_PAGES="100000",
+        WEBURL1=f"http://127.0.0.1:{server.server_port}/sale/kuala-lumpur/all-residential/",
+    )
+
+    # Every WebDriver command goes through WebDriver.execute
+    webdriver_calls = [0]
+    execute = WebDriver.execute
+    def counted_execute(driver, *execute_args, **execute_kwargs):
+        webdriver_calls[0] += 1
+        return execute(driver, *execute_args, **execute_kwargs)
+    WebDriver.execute = counted_execute
+
+    # This process plus chromedriver, Chrome and the parse pool
+    peak_rss, finished = [0], threading.Event()
+    def sample_rss():
+        process = psutil.Process()
+        while not finished.wait(0.05):
+            try:
+                peak_rss[0] = max(peak_rss[0], sum(p.memory_info().rss for p in [process, *process.children(recursive=True)]))
+            except psutil.Error:
+                continue
+    threading.Thread(target=sample_rss, daemon=True).start()
+
+    from main import Main
+    start = time.perf_counter()
+    Main("01", "kuala-lumpur").execute()
+    seconds = time.perf_counter() - start
+    finished.set()
+
+    # Extraction logs failures instead of raising them
+    if error_logs := glob.glob(os.path.join(os.environ["MAIN_DIR"], "logs", "error_log_*.log")):
+        sys.exit(pathlib.Path(error_logs[0]).read_text().strip())
+    listings = sum(len(pathlib.Path(csv_file).read_text(encoding="utf-8").splitlines()) - 1
+                   for csv_file in glob.glob(os.path.join(os.environ["MAIN_DIR"], "raw", "*.csv")))
+    print(json.dumps({"backend": name, "pages": server.RequestHandlerClass.served_pages, "listings": listings, "seconds": seconds,
+                      "webdriver_calls": webdriver_calls[0], "peak_rss_mb": peak_rss[0] / 1048576}))
+
+def bench_suite():
+    results = {}
+    for name, (_, needs_browser) in SUITE_BACKENDS.items():
+        if needs_browser and not args.browser:
+            continue
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-backend", name, "--pages", str(args.pages), "--latency", str(args.latency)],
+            capture_output=True, text=True, cwd=os.getcwd(),
+        )
+        lines = child.stdout.strip().splitlines()
+        if child.returncode != 0 or not lines or not lines[-1].startswith("{"):
+            print(f"{name:<14} failed: {(child.stderr or child.stdout).strip().splitlines()[-1:]}")
+            continue
+        results[name] = result = json.loads(lines[-1])
+        print(f"{name:<14} {result['pages']:>6} pages {result['listings']:>7} listings {result['seconds']:>9.3f} s "
+              f"{result['pages'] / result['seconds']:>9.1f} pages/s {result['listings'] / max(result['seconds'], 1e-9):>10.1f} listings/s "
+              f"{result['webdriver_calls'] / max(result['listings'], 1):>6.2f} WebDriver calls/listing {result['peak_rss_mb']:>7.0f} MB peak RSS")
+    if args.save:
+        with open(args.save, "w") as json_file:
+            json.dump(results, json_file, indent=4)
+    if args.baseline:
+        with open(args.baseline) as json_file:
+            baseline = json.load(json_file)
+        regressions = [
+            name for name, result in results.items()
+            if name in baseline and result["pages"] / result["seconds"] < 0.8 * baseline[name]["pages"] / baseline[name]["seconds"]
+        ]
+        for name in regressions:
+            print(f"Regression: {name} is more than 20% slower than {args.baseline}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    if args.run_backend:
+        run_backend(args.run_backend)
+    elif args.suite:
+        bench_suite()
+    else:
+        bench_lxml()
+        bench_state()
+        bench_xhr()
+        if args.browser:
+            bench_browser()
@@ -1,61 +1,41 @@
-import datetime, json, subprocess, os, re, time, sys
+import os, time, sys
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 dotenv_path = os.path.join(os.getcwd(), r'../../.env')
 load_dotenv(dotenv_path)
 mainDir = os.getenv("MAIN_DIR")
-schemaDir = os.path.join(mainDir, os.getenv("SCHEMA_DIR"))
 logDir = os.path.join(mainDir, os.getenv("LOG_DIR"))
-schemaFile = os.path.join(schemaDir, 'script.json')
-venvDir = os.path.join(mainDir, os.getenv("PY_ENV"))
-dataDir = os.path.join(mainDir, 'data')
-
-# Read the JSON file
-with open(schemaFile, 'r') as json_file:
-    data = json.load(json_file)
-
-# Divide the scripts into batches of 4
-script_list = list(data["Script"].items())
-batch_size = 2 # Max 16, Min 2, Ideal 4, Best 8
-
-# Initialize a variable to store the total execution time
-total_execution_time = 0
-
-for batch_number, i in enumerate(range(0, len(script_list), batch_size), start=1):
-    batch = script_list[i:i + batch_size]
-    subprocesses = []  # Store the Popen objects
-
-    for script_number, script_name in batch:
-        print(f"Running script {script_number}: {script_name}")
-        script_start_time = time.time()
-        current_time = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-
-        # Set the environment variable for the batch number
-        os.environ['BATCH_NUMBER'] = str(batch_number)
-
-        region_trim = re.search(r'_(.+?)/', script_name).group(1)
-        number_decimal_trim = re.search(r'(\d+)_', script_name).group(1)
-        number_trim = int(re.search(r'(\d+)_', script_name).group(1))
-        os.environ['MY_REGION'] = str(region_trim)
-        os.environ['SCRIPT_NUMBER_DECIMAL'] = number_decimal_trim
-        os.environ['SCRIPT_NUMBER'] = str(number_trim)
-        os.environ['SCRIPT_NAME'] = str(script_name)
-
-        # Start the script as a subprocess
-        with open(f'{logDir}/log_01_EXTRACT_{current_time}_out.log', 'w') as out, open(f'{logDir}/log_01_EXTRACT_{current_time}_err.log', 'w') as err:
-            # subprocess.Popen(['python', script_file], stdout=out, stderr=err)
-            subprocesses.append(subprocess.Popen(['python', script_name], shell=True, stdout=out, stderr=err))
-
-        print(f"Script {script_number} executed!")
-
-    # Wait for all subprocesses in the batch to complete
-    for process in subprocesses:
-        process.wait()
-
-    script_end_time = time.time()
-    script_execution_time = script_end_time - script_start_time
-    print(f"Script {script_number} executed in {script_execution_time} seconds.")
-total_execution_time += script_execution_time
-print(f"All scripts executed in {total_execution_time} seconds.")
-sys.exit(0)
+os.makedirs(logDir, exist_ok=True)
+
+# Modules (this directory is not on sys.path when run through runpy by auto/reserved/01_extract_auto.py)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from modules.config import Config
+from modules.scheduler import RegionScheduler
+from modules.browser_pool import BrowserPool
+from main import Main
+
+def run_region(script_number, region, worker_number):
+    Main(script_number, region, worker_number, browser_pool).execute()
+
+# Main: the parse pool's spawned processes import this file again (as __mp_main__), which must not start another run
+if __name__ == "__main__":
+    # Every region runs as a thread of this interpreter, so Python, pandas and Selenium are imported once.
+    # A free worker takes the next region straight away; regions are queued longest-first from previous run times.
+    region_list = Config.load_regions()
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else int(os.getenv("EXTRACT_WORKERS", "2")) # Max 16, Min 2, Ideal 4, Best 8
+
+    # One warm browser per worker, leased by each region and recycled after BROWSER_MAX_PAGES pages or BROWSER_MAX_RSS_MB
+    browser_pool = BrowserPool(Config(), workers)
+
+    total_start_time = time.time()
+    try:
+        browser_pool.warm_up()
+        scheduler = RegionScheduler(run_region, workers, os.path.join(logDir, 'extract_durations.json'))
+        scheduler.run(region_list)
+    finally:
+        browser_pool.close()
+
+    total_execution_time = time.time() - total_start_time
+    print(f"All regions executed in {total_execution_time} seconds.")
+    sys.exit(0)
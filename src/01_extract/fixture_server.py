@@ -0,0 +1,78 @@
+import argparse, os, re, time, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+# Serves the recorded pages in fixtures/ the way the site paginates, so the scrapers can run offline.
+#   python fixture_server.py --port 8000 --challenge 3
+#   python fixture_server.py --pages 50 --latency 200     # 50 pages, 200 ms per response
+#   WEBURL1="http://127.0.0.1:8000/sale/kuala-lumpur/all-residential/" FETCH_ENGINE=http python main.py 01
+# Any path answers; ?page=N returns fixtures/iproperty_page_N.html, page 1 without a query. With --pages the
+# recorded pages are cycled up to that many, with their own pagination bar and Property_IDs.
+CHALLENGE_PAGE = b"<html><body><p>Checking your browser before accessing iproperty.com.my</p><button id='button'>Continue</button></body></html>"
+PAGINATION_PATTERN = re.compile(r'<ul class="pagination">.*?</ul>', re.S)
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    fixtures = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+    challenge_pages = set()  # page numbers answered with the "Checking your browser" interstitial
+    pages = None  # None serves the recorded pages as they are
+    latency = 0.0  # seconds added to every response
+    served_pages = 0
+
+    @classmethod
+    def synthetic_page(cls, page_number):
+        recorded_pages = len([name for name in os.listdir(cls.fixtures) if re.fullmatch(r"iproperty_page_\d+\.html", name)])
+        recorded_page = (page_number - 1) % recorded_pages + 1
+        with open(os.path.join(cls.fixtures, f"iproperty_page_{recorded_page}.html"), encoding="utf-8") as html_file:
+            page_source = html_file.read()
+        items = [f'<li class="pagination-item"><a aria-label="Go to page {number}" href="?page={number}">{number}</a></li>'
+                 for number in sorted({1, max(1, page_number - 1), page_number, min(cls.pages, page_number + 1), cls.pages})]
+        disabled = " disabled" if page_number == cls.pages else ""
+        items.append(f'<li class="pagination-item"><a class="pagination-link{disabled}" aria-label="Go to next page" href="?page={min(cls.pages, page_number + 1)}">Next</a></li>')
+        page_source = PAGINATION_PATTERN.sub(lambda _: '<ul class="pagination">' + "".join(items) + "</ul>", page_source)
+        # sale-10000<recorded page><nn> -> sale-<page number, 7 digits><nn>, unique for every page
+        return page_source.replace(f"sale-10000{recorded_page}", f"sale-{page_number:07d}").encode("utf-8")
+
+    def do_GET(self):
+        page_number = int(parse_qs(urlsplit(self.path).query).get("page", ["1"])[0])
+        page_file = os.path.join(self.fixtures, f"iproperty_page_{page_number}.html")
+        time.sleep(self.latency)
+        if page_number in self.challenge_pages:
+            body = CHALLENGE_PAGE
+        elif self.pages is not None and 1 <= page_number <= self.pages:
+            body = self.synthetic_page(page_number)
+        elif self.pages is None and os.path.exists(page_file):
+            with open(page_file, "rb") as html_file:
+                body = html_file.read()
+        else:
+            self.send_error(404)
+            return
+        type(self).served_pages += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # keep benchmark output readable
+
+def serve(port=0, challenge_pages=(), fixtures=None, pages=None, latency=0.0):
+    """Start the server on a background thread and return it; port 0 picks a free port (server.server_port)."""
+    handler = type("Handler", (FixtureHandler,), {
+        "challenge_pages": set(challenge_pages), "fixtures": fixtures or FixtureHandler.fixtures,
+        "pages": pages, "latency": latency, "served_pages": 0,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve fixture pages with ?page=N pagination")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--challenge", type=int, nargs="*", default=[], help="page numbers answered with the browser check")
+    parser.add_argument("--pages", type=int, help="cycle the recorded pages up to this many pages")
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds added to every response")
+    args = parser.parse_args()
+    server = serve(args.port, args.challenge, pages=args.pages, latency=args.latency / 1000)
+    print(f"Serving fixtures on http://127.0.0.1:{server.server_port}/")
+    threading.Event().wait()
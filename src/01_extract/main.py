@@ -0,0 +1,47 @@
+import os, sys
+from dotenv import load_dotenv
+
+# Modules
+from modules.config import Config
+from modules.extraction import Extraction
+from modules.scheduler import RegionScheduler
+
+class Main:
+    def __init__(self, script_number, region, batch_number=1, browser_pool=None):
+        self.config = Config(script_number, region, batch_number)
+        self.browser_pool = browser_pool
+
+    def create_empty_csv_file(self):
+        self.config.create_empty_csv_file(Extraction(self.config).extractors.keys())
+
+    def initiate_scraper(self):
+        # The browser itself is started by scrape_and_save_data
+        self.scraper = Extraction(self.config, self.browser_pool)
+
+    def run_scraping_task(self):
+        self.scraper.scrape_and_save_data()
+
+    def execute(self):
+        self.config.create_folders()
+        self.create_empty_csv_file()
+        # self.create_empty_excel_file()
+        self.initiate_scraper()
+        self.run_scraping_task()
+
+def run_regions(regions, batch_number=1):
+    """Scrape several regions inside this interpreter, at most EXTRACT_WORKERS (one browser each) at a time."""
+    workers = int(os.getenv("EXTRACT_WORKERS", "2"))
+    log_dir = Config().log_dir
+    os.makedirs(log_dir, exist_ok=True)
+    scheduler = RegionScheduler(lambda script_number, region, worker_number: Main(script_number, region, batch_number).execute(),
+                                workers, os.path.join(log_dir, 'extract_durations.json'))
+    scheduler.run(regions)
+
+if __name__ == "__main__":
+    # python main.py            -> every region in schema/script.json
+    # python main.py 01 05      -> only Kuala Lumpur and Perak
+    load_dotenv(os.path.join(os.getcwd(), '../../.env'))
+    regions = Config.load_regions()
+    if selected := sys.argv[1:]:
+        regions = [(script_number, region) for script_number, region in regions if script_number in selected]
+    run_regions(regions)
@@ -0,0 +1,65 @@
+import os, gzip, json, threading
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:  # optional, gzip is used without it
+    zstandard = None
+
+class SnapshotArchive:
+    """Append-only archive of the raw HTML of every scraped page, one compressed member per page.
+
+    Each page is compressed on its own (zstd when the zstandard package is installed, gzip otherwise) and
+    appended to the archive; a JSON-lines index next to it records the URL, offset, length and fetch time, so
+    reparse.py can read any page back without decompressing the others.
+    """
+    def __init__(self, archive_name):
+        # archive_name has no extension, the codec decides between .html.zst and .html.gz
+        self.codec = "zstd" if zstandard else "gzip"
+        self.archive_file = f"{archive_name}.html.zst" if zstandard else f"{archive_name}.html.gz"
+        self.index_file = f"{self.archive_file}.idx"
+        self.lock = threading.Lock()
+        self.archive = None
+        self.index = None
+
+    @staticmethod
+    def compress(data, codec):
+        return zstandard.ZstdCompressor(level=10).compress(data) if codec == "zstd" else gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def decompress(data, codec):
+        return zstandard.ZstdDecompressor().decompress(data) if codec == "zstd" else gzip.decompress(data)
+
+    def append(self, url, page_source):
+        member = self.compress(page_source.encode('utf-8'), self.codec)
+        with self.lock:
+            if self.archive is None:
+                os.makedirs(os.path.dirname(self.archive_file), exist_ok=True)
+                self.archive = open(self.archive_file, 'ab')
+                self.index = open(self.index_file, 'a', encoding='utf-8')
+            offset = self.archive.tell()
+            self.archive.write(member)
+            self.archive.flush()
+            self.index.write(json.dumps({
+                "url": url, "offset": offset, "length": len(member), "codec": self.codec,
+                "fetched_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }) + "\n")
+            self.index.flush()
+
+    def close(self):
+        with self.lock:
+            if self.archive is not None:
+                self.archive.close()
+                self.index.close()
+                self.archive = self.index = None
+
+    @staticmethod
+    def read_index(archive_file):
+        with open(f"{archive_file}.idx", 'r', encoding='utf-8') as index_file:
+            return [json.loads(line) for line in index_file if line.strip()]
+
+    @staticmethod
+    def read_page(archive_file, entry):
+        with open(archive_file, 'rb') as archive:
+            archive.seek(entry["offset"])
+            return SnapshotArchive.decompress(archive.read(entry["length"]), entry["codec"]).decode('utf-8')
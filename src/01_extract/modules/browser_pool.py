@@ -0,0 +1,95 @@
+import queue, threading, psutil
+from selenium.common.exceptions import WebDriverException
+
+# Modules
+from .setup import Setup
+
+class BrowserPool:
+    """Warm, stealth-configured drivers that region jobs lease and return instead of starting their own Chrome.
+
+    A driver is recycled (quit and replaced) once it has served max_pages pages or its process tree grows past
+    max_rss_mb, and a driver that no longer answers is respawned before it is handed out again.
+    """
+    def __init__(self, config, size):
+        self.config = config
+        self.size = size
+        self.max_pages = config.browser_max_pages
+        self.max_rss_mb = config.browser_max_rss_mb
+        self.idle = queue.LifoQueue()  # most recently used first, its caches are the warmest
+        self.page_counts = {}
+        self.lock = threading.Lock()
+
+    def create(self):
+        driver = Setup.instantiate_browser(self.config.chrome_driver_file, Setup.setup_driver(self.config.chrome_binary, self.config.performance_log))
+        if self.config.blocked_urls:
+            Setup.block_resources(driver, self.config.blocked_urls)
+        with self.lock:
+            self.page_counts[id(driver)] = 0
+        return driver
+
+    def warm_up(self):
+        for _ in range(self.size):
+            self.idle.put(self.create())
+
+    def lease(self):
+        try:
+            driver = self.idle.get_nowait()
+        except queue.Empty:
+            return self.create()
+        return driver if self.is_alive(driver) else self.respawn(driver)
+
+    def release(self, driver):
+        if driver is None:
+            return
+        if not self.is_alive(driver) or self.needs_recycling(driver) or self.idle.qsize() >= self.size:
+            self.quit(driver)
+            return
+        self.idle.put(driver)
+
+    @staticmethod
+    def is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def rss_mb(driver):
+        # chromedriver plus every Chrome process it started
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            return sum(p.memory_info().rss for p in [process, *process.children(recursive=True)]) / 1048576
+        except (AttributeError, psutil.Error):
+            return 0
+
+    def needs_recycling(self, driver):
+        return self.page_counts.get(id(driver), 0) >= self.max_pages or self.rss_mb(driver) >= self.max_rss_mb
+
+    def record_page(self, driver):
+        """Count a served page; return the same driver, or a fresh one on the same URL once it is due for recycling."""
+        with self.lock:
+            self.page_counts[id(driver)] = self.page_counts.get(id(driver), 0) + 1
+        if not self.needs_recycling(driver):
+            return driver
+        current_url = driver.current_url
+        print(f"Recycling browser after {self.page_counts[id(driver)]} pages ({self.rss_mb(driver):.0f} MB)")
+        fresh_driver = self.respawn(driver)
+        fresh_driver.get(current_url)
+        return fresh_driver
+
+    def respawn(self, driver):
+        self.quit(driver)
+        return self.create()
+
+    def quit(self, driver):
+        with self.lock:
+            self.page_counts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def close(self):
+        while not self.idle.empty():
+            self.quit(self.idle.get_nowait())
@@ -0,0 +1,30 @@
+import os, json, threading
+
+class Checkpoint:
+    """Progress of one region on disk, so a run that died half way resumes instead of starting from page 1.
+
+    Holds the output CSV and its size after the last saved page, the pages whose rows are in that file and
+    the last page reached. Written after every page and deleted once the region finishes.
+    """
+    def __init__(self, checkpoint_file):
+        self.checkpoint_file = checkpoint_file
+        self.lock = threading.Lock()
+
+    def load(self):
+        if not os.path.exists(self.checkpoint_file):
+            return None
+        with open(self.checkpoint_file, 'r') as json_file:
+            return json.load(json_file)
+
+    def save(self, state):
+        os.makedirs(os.path.dirname(self.checkpoint_file), exist_ok=True)
+        with self.lock:
+            temp_file = f"{self.checkpoint_file}.tmp"
+            with open(temp_file, 'w') as json_file:
+                json.dump(state, json_file, indent=4)
+            os.replace(temp_file, self.checkpoint_file)
+
+    def delete(self):
+        with self.lock:
+            if os.path.exists(self.checkpoint_file):
+                os.remove(self.checkpoint_file)
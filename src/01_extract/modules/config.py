@@ -0,0 +1,241 @@
+import os, csv, json, functools
+from dotenv import load_dotenv
+from datetime import datetime
+
+#  Module
+from .extraction import Extraction
+from .setup import Setup
+from .checkpoint import Checkpoint
+from .archive import SnapshotArchive
+
+class Config:
+    def __init__(self, script_number=None, region=None, batch_number=1):
+        # One Config per region, so several regions can run side by side in one interpreter;
+        # without a region it only serves the shared settings (e.g. for the browser pool)
+        self.script_number = script_number  # e.g. '01', as keyed in schema/script.json
+        self.region = region  # e.g. 'kuala-lumpur'
+        self._batch_number = batch_number
+        self.load_environment_variables()
+
+    @functools.lru_cache(maxsize=None)
+    def get_formatted_datetime(self):
+        """Return a datetime string formatted for file names."""
+        return datetime.now().strftime("%Y%m%d_%H%M%S")  # e.g., '20231230_235959
+
+    @functools.lru_cache(maxsize=None)
+    def get_env_path(self, env_var):
+        """Retrieve the directory path from the environment variable."""
+        return os.path.join(os.getenv("MAIN_DIR"), os.getenv(env_var))
+
+    @property
+    def out_dir(self):
+        return self.get_env_path("RAW_DIR")
+
+    @property
+    def chrome_driver_file(self):
+        return os.path.join(self.get_env_path("CONFIG_DIR"), os.getenv("CHROME_DRIVER"))
+
+    @property
+    def chrome_binary(self):
+        # Only needed where Chrome is not on the default path, e.g. chrome-headless-shell on the Linux server
+        return os.getenv("CHROME_BINARY")
+
+    @property
+    def batch_number(self):
+        return str(self._batch_number)
+
+    @property
+    def csv_file(self):
+        return self.csv_file_path
+
+    @property
+    def extract_mode(self):
+        # 'element' queries each field through WebDriver, 'harvest' collects a whole page with one execute_script,
+        # 'lxml' parses driver.page_source offline in a worker pool, 'state' reads the page's embedded
+        # __NEXT_DATA__/Redux JSON instead and only falls back to the lxml XPaths when a page has none,
+        # 'xhr' takes the listing JSON the page downloads itself from Chrome's performance log
+        return os.getenv('EXTRACT_MODE', 'element').lower()
+
+    @property
+    def page_metrics(self):
+        # Bytes per page from Chrome's performance log, printed with each page's wait time
+        return os.getenv('PAGE_METRICS', 'true').lower() == 'true'
+
+    @property
+    def performance_log(self):
+        return self.extract_mode == 'xhr' or self.page_metrics
+
+    @property
+    def listing_response_pattern(self):
+        # Regex for the URLs of the JSON responses that carry listings
+        return os.getenv('LISTING_RESPONSE_PATTERN', r'graphql|/api/|listing')
+
+    @property
+    def parse_workers(self):
+        return int(os.getenv('PARSE_WORKERS', '2'))
+
+    @property
+    def pagination_mode(self):
+        # 'click' follows the "Go to next page" button, 'url' fetches page N directly by its ?page=N URL
+        return os.getenv('PAGINATION_MODE', 'click').lower()
+
+    @property
+    def tab_depth(self):
+        # Pages loading at once in tabs of one browser when pages are opened by URL (1 = no extra tabs)
+        return int(os.getenv('TAB_DEPTH', '1'))
+
+    @property
+    def fetch_engine(self):
+        # 'browser' drives Chrome for every page, 'http' fetches pages with aiohttp and only opens the ones
+        # behind the "Checking your browser" challenge in Chrome
+        return os.getenv('FETCH_ENGINE', 'browser').lower()
+
+    @property
+    def http_concurrency(self):
+        return int(os.getenv('HTTP_CONCURRENCY', '4'))
+
+    @property
+    def page_workers(self):
+        # Browsers sharing one region's pages when PAGINATION_MODE is 'url'
+        return int(os.getenv('PAGE_WORKERS', '1'))
+
+    @property
+    def blocked_urls(self):
+        # URL patterns blocked through Chrome DevTools; BLOCK_RESOURCES=false turns blocking off
+        if os.getenv('BLOCK_RESOURCES', 'true').lower() == 'false':
+            return []
+        if blocked_urls := os.getenv('BLOCKED_URLS'):
+            return [pattern.strip() for pattern in blocked_urls.split(',') if pattern.strip()]
+        return Setup.DEFAULT_BLOCKED_URLS
+
+    @property
+    def browser_max_pages(self):
+        return int(os.getenv('BROWSER_MAX_PAGES', '200'))
+
+    @property
+    def browser_max_rss_mb(self):
+        return float(os.getenv('BROWSER_MAX_RSS_MB', '1500'))
+
+    @property
+    def wait_min_timeout(self):
+        return float(os.getenv('WAIT_MIN_TIMEOUT', '5'))
+
+    @property
+    def wait_max_timeout(self):
+        # Also the timeout used before enough page loads have been observed to tune it
+        return float(os.getenv('WAIT_MAX_TIMEOUT', '30'))
+
+    @property
+    def incremental(self):
+        # Stop paginating once INCREMENTAL_STOP_PAGES pages in a row bring nothing new (listing_index.py)
+        return os.getenv('INCREMENTAL', 'false').lower() == 'true'
+
+    @property
+    def incremental_stop_pages(self):
+        return int(os.getenv('INCREMENTAL_STOP_PAGES', '3'))
+
+    @property
+    def index_dir(self):
+        return os.path.join(os.getenv("MAIN_DIR"), os.getenv("INDEX_DIR", os.path.join("data", "index")))
+
+    @property
+    def listing_index_file(self):
+        # One SQLite database for every region, see listing_index.py
+        return os.path.join(self.index_dir, "listings.db")
+
+    @property
+    def listing_bloom_capacity(self):
+        # Listings the Bloom filter is sized for at a 1% false-positive rate (about 1.2 MB per million)
+        return int(os.getenv('LISTING_BLOOM_CAPACITY', '1000000'))
+
+    @property
+    def selector_stats_file(self):
+        # Hits per XPath variant across runs, decides which variant is tried first (selector_registry.py)
+        return os.path.join(self.index_dir, "selector_stats.json")
+
+    @property
+    def archive_pages(self):
+        # Keep the compressed HTML of every page so reparse.py can rebuild the CSVs after a selector fix
+        return os.getenv('ARCHIVE_PAGES', 'false').lower() == 'true'
+
+    @property
+    def archive_dir(self):
+        return os.path.join(os.getenv("MAIN_DIR"), os.getenv("ARCHIVE_DIR", os.path.join("data", "archive")))
+
+    @functools.cached_property
+    def archive(self):
+        # Named after the run's CSV, so a resumed run keeps appending to the same archive
+        return SnapshotArchive(os.path.join(self.archive_dir, os.path.splitext(os.path.basename(self.csv_file_path))[0]))
+
+    @property
+    def checkpoint_dir(self):
+        return os.path.join(os.getenv("MAIN_DIR"), os.getenv("CHECKPOINT_DIR", os.path.join("data", "checkpoints")))
+
+    @functools.cached_property
+    def checkpoint(self):
+        return Checkpoint(os.path.join(self.checkpoint_dir, f"{self.script_number}_{self.region}.json"))
+
+    @functools.cached_property
+    def resume_state(self):
+        # Left behind by a run of this region that did not finish; None for a fresh start
+        if not self.region or not (state := self.checkpoint.load()):
+            return None
+        csv_file = state["csv_file"]
+        if not os.path.exists(csv_file) or os.path.getsize(csv_file) < state["offset"]:
+            # The rows of its saved pages are gone (raw CSVs are cleaned between runs), skipping those pages would lose them
+            print(f"[{self.region}] checkpoint ignored, {csv_file} is missing or shorter than the saved pages; starting over")
+            self.checkpoint.delete()
+            return None
+        return state
+
+    @property
+    def log_dir(self):
+        return self.get_env_path("LOG_DIR")
+
+    @property
+    def web_url(self):
+        return os.getenv(f"WEBURL{int(self.script_number)}")
+
+    @property
+    def headers(self):
+        # Assuming Extraction class has a way to provide headers
+        scraper = Extraction(self)
+        return list(scraper.extractors.keys())
+
+    @functools.cached_property
+    def csv_file_path(self):
+        if self.resume_state:
+            return self.resume_state["csv_file"]  # keep appending to the interrupted run's file
+        timestamp = self.get_formatted_datetime()
+        return os.path.join(self.out_dir, f"batch{self.batch_number}_{self.script_number}_{self.region}_iproperty_{timestamp}.csv")
+
+    @functools.cached_property
+    def json_file_path(self):
+        return os.path.join(self.out_dir, os.getenv('SCHEMA_DIR'))
+
+    @staticmethod
+    def load_regions():
+        """Return [(script_number, region), ...] from schema/script.json."""
+        with open(os.path.join(os.getenv("MAIN_DIR"), os.getenv("SCHEMA_DIR"), 'script.json'), 'r') as json_file:
+            return list(json.load(json_file)["Region"].items())
+
+    def load_environment_variables(self):
+        dotenv_path = os.path.join(os.getcwd(), '../../.env')
+        load_dotenv(dotenv_path)
+        # self.remove_existing_csv()
+
+    def create_folders(self):
+        os.makedirs(self.log_dir, exist_ok=True)
+        os.makedirs(self.out_dir, exist_ok=True)
+        
+        # Initialize the Extraction class
+        scraper = Extraction(self)
+        headers = scraper.extractors.keys()
+        self.create_empty_csv_file(headers)
+
+    def create_empty_csv_file(self, headers):
+        if self.resume_state:
+            return  # the interrupted run's file, checked by resume_state
+        with open(self.csv_file_path, 'w', newline='') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(headers)
@@ -0,0 +1,578 @@
+
+import os, time, asyncio, functools, threading, multiprocessing
+from collections import deque
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.service import Service as ChromeService
+
+# Modules
+from .mapping import Mapping, ListingContext
+from .setup import Setup
+from .save import OutputHandler
+from .waits import AdaptiveWait
+from .listing_index import ListingIndex
+from .http_fetch import HttpFetcher
+
+class Extraction:
+    def __init__(self, config, browser_pool=None):
+        #  Global scope
+        self.data = []
+        self.visited_urls = set()
+        self.pending_pages = {}  # lxml parse future -> page URL
+        self.saved_pages = set()  # pages whose rows are in the output file, recorded in the checkpoint
+        self.current_page_url = None
+        self.browser_restarts = 0
+        self.page_attempts = {}  # page number -> failed attempts, see requeue_failed_page
+        self.error = None  # what stopped a page worker (run_page_worker)
+        self.stale_pages = 0  # consecutive pages without a new or changed listing
+
+        # Shared warm browsers (browser_pool.py); without a pool every run starts and quits its own Chrome
+        self.browser_pool = browser_pool
+
+        # Import parameters from config.py
+        self.config = config
+        self.url = config.web_url
+        self.driver = config.chrome_driver_file
+
+        # Import parameters from save.py
+        self.output_handler = OutputHandler(config)
+
+        # Import parameters from local methods
+        self.extractors = self.initialize_extractors()
+
+    def initialize_extractors(self):
+        return {
+            "Page_Link": Mapping.extract_page_link,
+            "Source": Mapping.extract_source,
+            "Agent_Name": lambda listing: Mapping.extract_element_text(listing, Mapping.AGENT_NAME_XPATH),
+            "Posted_Date": lambda listing: Mapping.extract_element_text(listing, Mapping.POSTED_DATE_XPATH),
+            "House_Price": lambda listing: Mapping.extract_element_text(listing, Mapping.HOUSE_PRICE_XPATH),
+            "Price_Square_Feet": Mapping.extract_price_square_feet,
+            "House_Name": lambda listing: Mapping.extract_element_text(listing, Mapping.HOUSE_NAME_XPATH),
+            "House_Location": lambda listing: Mapping.extract_element_text(listing, Mapping.HOUSE_LOCATION_XPATH),
+            "House_Type": Mapping.extract_house_type,
+            "Lot_Type": Mapping.extract_lot_type,
+            "Square_Footage": Mapping.extract_square_footage,
+            "House_Furniture": Mapping.extract_house_furniture,
+            "Created_At": Mapping.get_current_datetime
+        }
+
+    def start_browser(self):
+        if self.browser_pool:
+            self.driver = self.browser_pool.lease()
+        else:
+            chrome_options = Setup.setup_driver(self.config.chrome_binary, self.config.performance_log)
+            self.driver = Setup.instantiate_browser(self.config.chrome_driver_file, chrome_options)
+            if self.config.blocked_urls:
+                Setup.block_resources(self.driver, self.config.blocked_urls)
+        self.waits = AdaptiveWait(self.driver, self.config.wait_min_timeout, self.config.wait_max_timeout, self.config.region)
+
+    def stop_browser(self):
+        if 'waits' not in self.__dict__:
+            return  # the browser was never started
+        if self.browser_pool:
+            self.browser_pool.release(self.driver)
+        else:
+            self.driver.quit()
+
+    def switch_driver(self, driver):
+        if driver is not self.driver:
+            self.driver = driver
+            self.waits.driver = driver
+            self.waits.for_listings()
+
+    def recover_browser(self):
+        """Respawn a crashed pooled browser on the last page; False when there is nothing to recover."""
+        if not self.browser_pool or self.browser_pool.is_alive(self.driver) or self.browser_restarts >= 3:
+            return False
+        self.browser_restarts += 1
+        print(f"Browser crashed, respawning ({self.browser_restarts}/3)")
+        self.driver = self.browser_pool.respawn(self.driver)
+        self.waits.driver = self.driver
+        self.driver.get(self.current_page_url or self.url)
+        self.waits.for_listings()
+        return True
+
+    def setup_driver_and_browser(self):
+        self.start_browser()
+        self.driver.get(self.url)
+        self.waits.for_listings()
+
+    def instantiate_browser(self, chrome_driver_file, chrome_options):
+        service = ChromeService(chrome_driver_file)
+        web_driver = webdriver.Chrome(service=service, options=chrome_options)
+        Setup.configure_stealth(web_driver)
+
+    @property
+    def find_listings(self):
+        return self.driver.find_elements(By.XPATH, Mapping.LISTING_XPATH)
+
+    def extract_data_from_listing(self, listing):
+        listing = ListingContext(listing)
+        return {
+            key: self._extract_data_value(value, listing)
+            for key, value in self.extractors.items()
+        }
+
+    def _extract_data_value(self, value, listing):
+        return self._extract_callable_data(value, listing) if callable(value) else Mapping.extract_element_text(listing, value)
+
+    def _extract_callable_data(self, value, listing):
+        return value(listing) if self._function_expects_argument(value) else value()
+
+    def _function_expects_argument(self, func):
+        return func.__code__.co_argcount > 0
+
+    def scrape_page(self):
+        current_url = self.driver.current_url
+        if current_url in self.visited_urls:
+            return
+        self.visited_urls.add(current_url)
+        self.current_page_url = current_url
+        # Read once, the page metrics and the 'xhr' mode share it
+        network_events = Setup.network_events(self.driver) if self.config.performance_log else None
+        if 'waits' in self.__dict__:
+            self.waits.finish_page(current_url, Setup.page_metrics(self.driver, network_events))
+        # The HTML is read once, whether it is archived, parsed offline or both
+        page_source = self.driver.page_source if self.config.archive_pages or self.config.extract_mode in ("lxml", "state") else None
+        if self.config.archive_pages:
+            self.config.archive.append(current_url, page_source)
+        # Only a page opened by its URL was loaded as a new document; after a Next click the page state is still page 1's
+        fresh_document = self.config.pagination_mode == "url"
+        if self.config.extract_mode == "xhr":
+            # A server-rendered first page has no listing XHR, its data is in the embedded page state
+            rows = Mapping.parse_listing_responses(Setup.listing_responses(self.driver, self.config.listing_response_pattern, network_events), current_url)
+            self._process_listings(rows or Mapping.parse_page_state(page_source or self.driver.page_source, current_url, fresh_document), Mapping.map_raw_fields, current_url)
+        elif self.config.extract_mode == "harvest":
+            self._process_listings(Mapping.harvest_listings(self.driver), Mapping.map_raw_fields, current_url)
+        elif self.config.extract_mode in ("lxml", "state"):
+            # Parse in the pool while the browser moves on to the next page
+            parse = functools.partial(Mapping.parse_page_state, fresh_document=fresh_document) if self.config.extract_mode == "state" else Mapping.parse_page_source
+            self.pending_pages[self.parse_pool.submit(Mapping.parse_in_pool, parse, page_source, current_url)] = current_url
+            self.collect_parsed_pages()
+        else:
+            self._process_listings(self.find_listings, self.extract_data_from_listing, current_url)
+        if self.browser_pool:
+            self.switch_driver(self.browser_pool.record_page(self.driver))
+
+    @functools.cached_property
+    def listing_index(self):
+        # Listings seen by every region and run so far; incremental crawls stop on pages of known listings
+        return ListingIndex.open(self.config.listing_index_file, self.config.listing_bloom_capacity)
+
+    @functools.cached_property
+    def parse_pool(self):
+        # Spawned, not forked: a fork copies locks other page workers hold at that moment (SelectorRegistry.lock,
+        # the Selenium and logging locks) and the child can block on them forever
+        return ProcessPoolExecutor(max_workers=self.config.parse_workers, mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=Mapping.load_selector_stats, initargs=(self.config.selector_stats_file,))
+
+    def collect_parsed_pages(self, wait=False):
+        for future in list(self.pending_pages):
+            if wait or future.done():
+                rows, selector_counts = future.result()
+                Mapping.selectors.merge(selector_counts)
+                self._process_listings(rows, Mapping.map_raw_fields, self.pending_pages.pop(future))
+
+    def _process_listings(self, listings, extract, page_url):
+        fresh_listings = 0
+        self.listing_index.refresh()  # listings other region workers stored since the last page
+        for listing in listings:
+            try:
+                data = extract(listing)
+                self.data.append(data)
+                fresh_listings += self.listing_index.observe(data, self.config.region)
+            except Exception as e:
+                print(f"Error processing listing: {e}")
+        self.listing_index.flush()
+        self.stale_pages = 0 if fresh_listings else self.stale_pages + 1
+        # Rows, saved page and checkpoint under one lock: a page worker appending in between would otherwise leave
+        # its page recorded as saved with its rows past the recorded offset, cut off on resume
+        with self.output_handler.lock:
+            self.save_and_clear_data()
+            self.saved_pages.add(page_url)
+            self.save_checkpoint(page_url)
+
+    def save_checkpoint(self, page_url):
+        with self.output_handler.lock:
+            self.config.checkpoint.save({
+                "csv_file": self.config.csv_file,
+                "offset": self.output_handler.offset,
+                "page_url": page_url,  # last saved page, pages still being parsed are not in the file yet
+                "saved_pages": sorted(self.saved_pages),
+            })
+
+    def resume_from_checkpoint(self):
+        """Skip the pages an interrupted run already saved; return the page it had reached, if any."""
+        if not (state := self.config.resume_state):
+            return None
+        if not self.saved_pages:  # already applied when the HTTP engine hands the region over to Chrome
+            print(f"[{self.config.region}] resuming from {state['page_url']}, {len(state['saved_pages'])} pages already saved")
+            OutputHandler.truncate(self.config.csv_file, state["offset"])
+            self.saved_pages.update(state["saved_pages"])
+            self.visited_urls.update(state["saved_pages"])
+        return state["page_url"]
+
+    def reached_known_listings(self):
+        if not self.config.incremental or self.stale_pages < self.config.incremental_stop_pages:
+            return False
+        print(f"[{self.config.region}] {self.stale_pages} pages without new or changed listings, stopping.")
+        return True
+
+    def save_and_clear_data(self):
+        output_csv_file = self.initialize_output_csv()
+
+        # Check and fill 'Posted Date' if necessary
+        for item in self.data:
+            item.setdefault('Posted Date', None)  # Ensure 'Posted Date' is present
+
+        # Now, save the data to files
+        self.save_data_to_csv(output_csv_file)
+        # self.save_data_to_excel(output_excel_file)
+        self.data.clear()  # Clear the data after saving
+
+    def wait_for_next_page_button(self):
+        return self.waits.for_next_page_button()
+
+    def scrape_all_pages(self, progress_bar):
+        while True:
+            try:
+                if not self.scrape_next_page(progress_bar):
+                    return
+            except WebDriverException:
+                if not self.recover_browser():
+                    raise
+
+    def scrape_next_page(self, progress_bar):
+        self.scrape_page()
+        progress_bar.update(1)
+
+        if self.check_browser_message():
+            self.handle_browser_message()
+
+        if self.reached_known_listings() or not self.has_next_page():
+            print("Scraping finished.")
+            return False
+
+        self.scroll_to_bottom()  # Scroll to the bottom before clicking the next page button
+        old_url, old_listing = self.driver.current_url, next(iter(self.find_listings), None)
+        self.click_next_page_button()
+        self.waits.for_page_change(old_url, old_listing)
+
+        # After navigating to the next page, scrape data from the new page
+        self.scrape_page()
+        return True
+
+    def check_browser_message(self):
+        return "Checking your browser" in self.driver.page_source
+
+    def handle_browser_message(self):
+        self.waits.for_clickable(By.ID, "button").click()
+
+    def scroll_to_bottom(self):
+        self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        self.waits.for_next_page_button()  # Lazy-loaded pagination is in place once the button exists
+
+    def has_next_page(self):
+        next_page_button = self.wait_for_next_page_button()
+        return next_page_button is not None and 'disabled' not in next_page_button.get_attribute('class')
+
+    def click_next_page_button(self):
+        if next_page_button := self.wait_for_next_page_button():
+            next_page_button.click()
+
+    def discover_page_count(self):
+        page_numbers = [int(text) for item in self.driver.find_elements(By.XPATH, Mapping.PAGINATION_XPATH) if (text := item.text.strip()).isdigit()]
+        return max(page_numbers, default=1)
+
+    @staticmethod
+    def page_number(page_url):
+        return int(dict(parse_qsl(urlsplit(page_url).query)).get('page', 1))
+
+    def first_unsaved_page(self):
+        # Parsed pages are saved in the order their parses finish, so an earlier page may be missing after a kill
+        saved_page_numbers = {self.page_number(page_url) for page_url in self.saved_pages}
+        return next(page_number for page_number in range(1, len(saved_page_numbers) + 2) if page_number not in saved_page_numbers)
+
+    def page_url(self, page_number):
+        url_parts = urlsplit(self.url)
+        query = dict(parse_qsl(url_parts.query))
+        query['page'] = str(page_number)
+        return urlunsplit(url_parts._replace(query=urlencode(query)))
+
+    def open_page(self, page_number):
+        self.driver.get(self.page_url(page_number))
+        if self.check_browser_message():
+            self.handle_browser_message()
+        self.waits.for_listings()
+
+    @staticmethod
+    def next_page(pending):
+        # pending is shared by the page workers of a region, another one may have emptied it since the last check
+        try:
+            return pending.popleft()
+        except IndexError:
+            return None
+
+    def requeue_failed_page(self, page_number, pending, error):
+        """Put a failed page back on the queue, and raise when this browser cannot retry it.
+
+        A page is retried after the browser was respawned, or once with the same browser. Otherwise the error
+        stops this browser; another page worker may still take the page, else the region ends with the error
+        and keeps its checkpoint, so the next run picks the page up again.
+        """
+        self.page_attempts[page_number] = self.page_attempts.get(page_number, 0) + 1
+        pending.append(page_number)  # behind the pages not tried yet
+        if not self.recover_browser() and self.page_attempts[page_number] > 1:
+            raise error
+
+    def scrape_page_numbers(self, pending, progress_bar):
+        # pending: deque of page numbers, shared with the other page workers of the region
+        if self.config.tab_depth > 1:
+            return self.scrape_page_numbers_in_tabs(pending, progress_bar)
+        while not self.reached_known_listings() and (page_number := self.next_page(pending)) is not None:
+            try:
+                self.open_page(page_number)
+                self.scrape_page()
+            except Exception as e:
+                print(f"Error scraping page {page_number}: {e}")
+                self.requeue_failed_page(page_number, pending, e)
+                continue
+            progress_bar.update(1)
+
+    def load_in_tab(self, handle, page_number):
+        # Returns at once; the old document is emptied so the listing wait cannot match it while the new one loads
+        self.driver.switch_to.window(handle)
+        self.driver.execute_script("document.documentElement.innerHTML = ''; window.location.assign(arguments[0]);", self.page_url(page_number))
+
+    def open_tabs(self, count):
+        handles = [self.driver.current_window_handle]
+        while len(handles) < count:
+            self.driver.switch_to.new_window('tab')
+            # CDP overrides apply per tab, the first tab's stealth scripts and blocked URLs do not cover this one
+            Setup.configure_stealth(self.driver)
+            if self.config.blocked_urls:
+                Setup.block_resources(self.driver, self.config.blocked_urls)
+            handles.append(self.driver.current_window_handle)
+        return handles
+
+    def close_tabs(self, handles):
+        # A pooled browser goes back with a single tab
+        for handle in handles[1:]:
+            if handle in self.driver.window_handles:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+        self.driver.switch_to.window(self.driver.window_handles[0])
+
+    def scrape_page_numbers_in_tabs(self, pending, progress_bar):
+        """Keep up to TAB_DEPTH pages loading in tabs of one browser and scrape each tab when its turn comes."""
+        while pending and not self.reached_known_listings():
+            self.pipeline_tabs(pending, progress_bar)
+
+    def pipeline_tabs(self, pending, progress_bar):
+        # Stops early when the browser was recycled or respawned, with its unscraped pages back on pending, so the tabs are reopened
+        driver = self.driver
+        handles = self.open_tabs(min(self.config.tab_depth, max(1, len(pending))))
+        in_flight = deque()
+        for handle in handles:
+            if (page_number := self.next_page(pending)) is None:
+                break
+            self.load_in_tab(handle, page_number)
+            in_flight.append((handle, page_number))
+
+        while in_flight:
+            handle, page_number = in_flight.popleft()
+            try:
+                self.driver.switch_to.window(handle)
+                if self.check_browser_message():
+                    self.handle_browser_message()
+                self.waits.for_listings()
+                self.scrape_page()
+                progress_bar.update(1)
+            except Exception as e:
+                print(f"Error scraping page {page_number}: {e}")
+                try:
+                    self.requeue_failed_page(page_number, pending, e)
+                except Exception:
+                    pending.extendleft(page_number for _, page_number in in_flight)  # left for the other page workers
+                    raise
+            if self.driver is not driver:
+                pending.extendleft(page_number for _, page_number in in_flight)
+                return
+            if self.reached_known_listings():
+                pending.clear()
+            elif (next_page := self.next_page(pending)) is not None:
+                self.load_in_tab(handle, next_page)
+                in_flight.append((handle, next_page))
+        self.close_tabs(handles)
+
+    def spawn_page_worker(self):
+        # Own browser and buffers, shared output file (and therefore shared Property_ID de-duplication);
+        # the listing index is shared by every Extraction of the process anyway
+        page_worker = Extraction(self.config, self.browser_pool)
+        page_worker.output_handler = self.output_handler
+        page_worker.saved_pages = self.saved_pages
+        page_worker.visited_urls = self.visited_urls
+        return page_worker
+
+    def run_page_worker(self, pending, progress_bar):
+        try:
+            self.start_browser()
+            self.scrape_page_numbers(pending, progress_bar)
+            self.collect_parsed_pages(wait=True)
+            self.waits.report()
+        except Exception as e:
+            # The pages this worker had not taken yet stay on pending for the others; the region re-raises the error
+            self.log_exception(e)
+            self.error = e
+        finally:
+            self.stop_browser()
+            if 'parse_pool' in self.__dict__:
+                self.parse_pool.shutdown()
+
+    def scrape_pages_by_url(self, progress_bar):
+        """Fetch page N by URL so the pages of one region can be split across several browsers."""
+        self.output_handler.dedupe_by_property_id = True
+        remaining_pages = [page_number for page_number in range(2, progress_bar.total + 1) if self.page_url(page_number) not in self.saved_pages]
+        self.scrape_page()  # page 1 is already loaded
+        progress_bar.update(progress_bar.total - len(remaining_pages))
+
+        # One queue for all the browsers: a page that failed goes back on it, and a worker that died leaves its pages to the others
+        pending = deque(remaining_pages)
+        workers = [self.spawn_page_worker() for _ in range(1, max(1, min(self.config.page_workers, len(remaining_pages))))]
+        threads = [threading.Thread(target=worker.run_page_worker, args=(pending, progress_bar)) for worker in workers]
+        for thread in threads:
+            thread.start()
+        try:
+            self.scrape_page_numbers(pending, progress_bar)
+        finally:
+            for thread in threads:
+                thread.join()
+        self.scrape_page_numbers(pending, progress_bar)  # pages left behind by workers that died after this browser finished
+        self.collect_parsed_pages(wait=True)
+        errors = [worker.error for worker in workers if worker.error]
+        if errors and any(self.page_url(page_number) not in self.saved_pages for page_number in remaining_pages):
+            raise errors[0]  # keeps the checkpoint, the next run retries the pages the dead workers did not save
+
+    def scrape_with_http(self):
+        """Fetch the region over plain HTTP, opening Chrome only for challenged pages; False when page 1 is challenged."""
+        self.resume_from_checkpoint()
+        if (result := asyncio.run(self.fetch_pages_over_http())) is None:
+            print(f"[{self.config.region}] page 1 needs a browser, scraping the region in Chrome")
+            return False
+        progress_bar, browser_pages = result
+        if browser_pages:
+            print(f"[{self.config.region}] {len(browser_pages)} pages hit the browser check, opening them in Chrome")
+            self.start_browser()
+            self.scrape_page_numbers(deque(browser_pages), progress_bar)
+        return True
+
+    async def fetch_pages_over_http(self):
+        async with HttpFetcher(self.config.http_concurrency, self.config.wait_max_timeout) as fetcher:
+            if (first_page := await fetcher.fetch(self.url)) is None:
+                return None
+            total_pages = Mapping.parse_page_count(first_page)
+            progress_bar = tqdm(total=total_pages, desc="Scraping Progress", unit="page")
+            page_urls = {1: self.url, **{page_number: self.page_url(page_number) for page_number in range(2, total_pages + 1)}}
+            page_numbers = [page_number for page_number, url in page_urls.items() if url not in self.saved_pages]
+            progress_bar.update(total_pages - len(page_numbers))
+
+            # One batch of concurrent fetches at a time, so an incremental crawl can still stop early
+            browser_pages, loop = [], asyncio.get_running_loop()
+            for batch_start in range(0, len(page_numbers), self.config.http_concurrency):
+                if self.reached_known_listings():
+                    break
+                batch = page_numbers[batch_start:batch_start + self.config.http_concurrency]
+                sources = await fetcher.fetch_many([page_urls[page_number] for page_number in batch if page_number != 1])
+                if batch[0] == 1:
+                    sources.insert(0, first_page)
+                parsed = await asyncio.gather(*(
+                    loop.run_in_executor(self.parse_pool, Mapping.parse_in_pool, Mapping.parse_page_state, page_source, page_urls[page_number])
+                    for page_number, page_source in zip(batch, sources) if page_source is not None
+                ))
+                for page_number, page_source in zip(batch, sources):
+                    if page_source is None:
+                        browser_pages.append(page_number)  # counted by scrape_page_numbers
+                        continue
+                    self.visited_urls.add(page_urls[page_number])
+                    if self.config.archive_pages:
+                        self.config.archive.append(page_urls[page_number], page_source)
+                    rows, selector_counts = parsed.pop(0)
+                    Mapping.selectors.merge(selector_counts)
+                    self._process_listings(rows, Mapping.map_raw_fields, page_urls[page_number])
+                    progress_bar.update(1)
+            return progress_bar, browser_pages
+
+    def perform_scraping(self):
+        if self.config.fetch_engine != "http" or not self.scrape_with_http():
+            progress_bar = self.initialize_scraping_process()
+            if self.config.pagination_mode == "url":
+                self.scrape_pages_by_url(progress_bar)
+            else:
+                self.scrape_all_pages(progress_bar)
+        self.collect_parsed_pages(wait=True)
+
+    def initialize_scraping_process(self):
+        resume_page_url = self.resume_from_checkpoint()
+        self.setup_driver_and_browser()
+        total_pages = self.discover_page_count()
+        progress_bar = tqdm(total=total_pages, desc="Scraping Progress", unit="page")
+        if resume_page_url and self.config.pagination_mode != "url":
+            # Clicking only moves forward, so reopen the first page not saved yet and carry on from its next button;
+            # the saved pages after it are in visited_urls and are clicked through without scraping
+            if (page_number := self.first_unsaved_page()) > 1:
+                self.driver.get(self.page_url(page_number))
+                self.waits.for_listings()
+            progress_bar.update(len(self.saved_pages))
+        return progress_bar
+
+    def initialize_output_csv(self):
+        return self.config.csv_file
+
+    def save_data_to_csv(self, output_csv_file):
+        try:
+            self.output_handler.open(output_csv_file, self.extractors.keys())
+            self.output_handler.save_data_to_csv(self.data)
+        except Exception as e:
+            print(f"Error during save: {e}")
+
+    def initialize_and_save_output_files(self):
+        output_csv_file = self.initialize_output_csv()
+        self.save_data_to_csv(output_csv_file) # Save to CSV
+        self.output_handler.compact()
+
+    def scrape_and_save_data(self):
+        try:
+            Mapping.selectors.load(self.config.selector_stats_file)  # winning variants of earlier runs first
+            self.perform_scraping()
+            self.initialize_and_save_output_files()
+            self.listing_index.save(self.config.region)
+            self.config.checkpoint.delete()
+            if 'waits' in self.__dict__:
+                self.waits.report()  # not started when every page came over HTTP
+            Mapping.selectors.report()
+            Mapping.selectors.save(self.config.selector_stats_file)
+
+        except Exception as e:
+            self.log_exception(e)
+            self.collect_parsed_pages(wait=True)  # pages parsed before the failure still reach the file and the checkpoint
+
+        finally:
+            self.output_handler.close()
+            if self.config.archive_pages:
+                self.config.archive.close()
+            self.stop_browser()
+            if 'parse_pool' in self.__dict__:
+                self.parse_pool.shutdown()
+
+    def log_exception(self, e):
+        error_message = f"An error occurred: {str(e)}"
+        print(error_message)
+        timestamp = time.strftime("%Y%m%d-%H%M%S")
+        log_file_name = os.path.join(self.config.log_dir, f"error_log_{self.config.region}_{timestamp}.log")
+        with open(log_file_name, "w") as log_file:
+            log_file.write(error_message + "\n")
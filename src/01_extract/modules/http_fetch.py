@@ -0,0 +1,47 @@
+import asyncio, aiohttp
+
+class HttpFetcher:
+    """Fetches result pages over plain HTTP on one keep-alive session, at most `concurrency` at a time.
+
+    A page comes back as None when it needs a real browser: the "Checking your browser" challenge, a non-200
+    answer or a network error. The caller opens those pages in Chrome instead.
+    """
+    CHALLENGE_MARKER = "Checking your browser"
+    # Same user agent selenium-stealth gives the browser
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/83.0.4103.53 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+
+    def __init__(self, concurrency, timeout):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.session = None
+        self.semaphore = None
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=self.HEADERS,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def fetch(self, url):
+        async with self.semaphore:
+            try:
+                async with self.session.get(url) as response:
+                    if response.status != 200:
+                        return None
+                    page_source = await response.text()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+        return None if self.CHALLENGE_MARKER in page_source else page_source
+
+    async def fetch_many(self, urls):
+        return await asyncio.gather(*(self.fetch(url) for url in urls))
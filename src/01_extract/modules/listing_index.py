@@ -0,0 +1,154 @@
+import os, re, math, sqlite3, hashlib, threading
+from datetime import datetime, timedelta
+
+# Modules
+from .mapping import Mapping
+
+class BloomFilter:
+    """Fixed-size bit array answering 'definitely not seen' without touching the database."""
+    def __init__(self, capacity, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, key):
+        # Double hashing: k positions from the two halves of one blake2b digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for position in self.positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(key))
+
+class ListingIndex:
+    """Every listing seen by any region, on disk in SQLite and shared by all workers of all regions.
+
+    Rows hold Property_ID, region, Page_Link, the hash of the listing's fields and when it was last seen; each
+    region also keeps its newest Posted_Date as a watermark. A Bloom filter in front of the database answers
+    most lookups for new listings from memory; refresh() adds the rows other processes wrote since, so it never
+    calls a listing new that another region worker already stored. Incremental crawls (INCREMENTAL=true) treat
+    a listing as fresh when it is new, changed, or posted after the region's watermark.
+    """
+    # Posted_Date is left out of the hash because 'posted today' turns into 'posted yesterday' overnight
+    HASHED_FIELDS = ["Page_Link", "Agent_Name", "House_Price", "Price_Square_Feet", "House_Name", "House_Location", "House_Type", "Lot_Type", "Square_Footage", "House_Furniture"]
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS listings (
+            property_id TEXT PRIMARY KEY, region TEXT, page_link TEXT, row_hash TEXT, last_seen TEXT);
+        CREATE TABLE IF NOT EXISTS watermarks (region TEXT PRIMARY KEY, posted_date TEXT);
+    """
+    instances = {}
+    instances_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, index_file, bloom_capacity=1000000):
+        """One index per database file and process, so region threads share the Bloom filter and the write lock."""
+        with cls.instances_lock:
+            if index_file not in cls.instances:
+                cls.instances[index_file] = cls(index_file, bloom_capacity)
+            return cls.instances[index_file]
+
+    def __init__(self, index_file, bloom_capacity=1000000):
+        self.index_file = index_file
+        self.lock = threading.Lock()
+        self.local = threading.local()  # sqlite3 connections cannot be shared across threads
+        self.pending = {}  # property_id -> row, written by flush()
+        self.watermarks = {}  # region -> watermark of the previous run, read when the region starts
+        self.newest_posted_dates = {}  # region -> newest Posted_Date seen, the next watermark
+        self.last_rowid = 0  # newest listings row already in the Bloom filter
+        os.makedirs(os.path.dirname(index_file), exist_ok=True)
+        self.connection.executescript(self.SCHEMA)
+        self.bloom = BloomFilter(bloom_capacity)
+        self.refresh()
+
+    @property
+    def connection(self):
+        if not hasattr(self.local, 'connection'):
+            # WAL lets other processes (or a later stage) read while a region writes
+            self.local.connection = sqlite3.connect(self.index_file, timeout=30)
+            self.local.connection.execute("PRAGMA journal_mode=WAL")
+            self.local.connection.execute("PRAGMA synchronous=NORMAL")
+        return self.local.connection
+
+    @staticmethod
+    def row_hash(record):
+        values = [str(record.get(field) or '').strip().lower() for field in ListingIndex.HASHED_FIELDS]
+        return hashlib.md5('\x1f'.join(values).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def parse_posted_date(posted_date, today=None):
+        """'Posted today 10:15 am' / 'Posted yesterday' / 'Posted on 12 Oct 2026' -> '2026-10-12'."""
+        if not posted_date:
+            return None
+        today = today or datetime.now()
+        posted_date = posted_date.lower()
+        if 'today' in posted_date:
+            return today.strftime('%Y-%m-%d')
+        if 'yesterday' in posted_date:
+            return (today - timedelta(days=1)).strftime('%Y-%m-%d')
+        if date_match := re.search(r'(\d{1,2} [a-z]{3} \d{4})', posted_date):
+            try:
+                return datetime.strptime(date_match[1], '%d %b %Y').strftime('%Y-%m-%d')
+            except ValueError:
+                return None
+        return None
+
+    def refresh(self):
+        """Add the listings written since the last refresh, by this or any other process, to the Bloom filter."""
+        with self.lock:
+            # INSERT OR REPLACE gives a replaced row a new rowid, so rows past last_rowid are every new or updated listing
+            for rowid, property_id in self.connection.execute("SELECT rowid, property_id FROM listings WHERE rowid > ? ORDER BY rowid", (self.last_rowid,)):
+                self.bloom.add(property_id)
+                self.last_rowid = rowid
+
+    def watermark(self, region):
+        # Read once per region and run: a region started after another process saved its watermark sees the new one
+        if region not in self.watermarks:
+            row = self.connection.execute("SELECT posted_date FROM watermarks WHERE region = ?", (region,)).fetchone()
+            self.watermarks[region] = row[0] if row else None
+            self.newest_posted_dates.setdefault(region, self.watermarks[region])
+        return self.watermarks[region]
+
+    def stored_hash(self, property_id):
+        if property_id in self.pending:
+            return self.pending[property_id][3]
+        if property_id not in self.bloom:
+            return None  # definitely new, no query needed
+        row = self.connection.execute("SELECT row_hash FROM listings WHERE property_id = ?", (property_id,)).fetchone()
+        return row[0] if row else None
+
+    def observe(self, record, region):
+        """Record one scraped listing and return True when it is new, changed or newer than the region's watermark."""
+        property_id = Mapping.parse_property_id(record.get("Page_Link"))
+        if property_id is None:
+            return True
+        row_hash = self.row_hash(record)
+        posted_date = self.parse_posted_date(record.get("Posted_Date"))
+        with self.lock:
+            watermark = self.watermark(region)
+            previous_hash = self.stored_hash(property_id)
+            self.pending[property_id] = (property_id, region, record.get("Page_Link"), row_hash, datetime.now().isoformat(timespec='seconds'))
+            self.bloom.add(property_id)
+            if posted_date and posted_date > (self.newest_posted_dates.get(region) or ''):
+                self.newest_posted_dates[region] = posted_date
+        after_watermark = posted_date is not None and watermark is not None and posted_date > watermark
+        return previous_hash != row_hash or after_watermark
+
+    def flush(self):
+        with self.lock:
+            if not self.pending:
+                return
+            with self.connection:
+                self.connection.executemany("INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?, ?)", list(self.pending.values()))
+            self.pending.clear()
+
+    def save(self, region):
+        """Write pending listings and move the region's watermark to the newest Posted_Date of this run."""
+        self.flush()
+        if posted_date := self.newest_posted_dates.get(region):
+            with self.lock, self.connection:
+                self.connection.execute("INSERT OR REPLACE INTO watermarks VALUES (?, ?)", (region, posted_date))
+                self.watermarks[region] = posted_date
@@ -0,0 +1,401 @@
+import re, json, datetime
+from urllib.parse import urljoin
+from lxml import etree, html as lxml_html
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+from .selector_registry import SelectorRegistry
+
+class Mapping:
+    LISTING_XPATH = "//li[contains(@class,'ListingsListstyle__ListingListItemWrapper')]"
+    PAGE_LINK_XPATH = ".//div[contains(@class,'slick-slide slick-active slick-current')]/a[contains(@class,'depth-listing-card-link')] | .//div[contains(@class,'BasicCardstyle__ListingImageWrapper-iZfXFa kjZOzk')]/a[contains(@class,'depth-listing-card-link')] | .//div[contains(@class,'ListingContactDetailsButtonstyle__ButtonsWrapper')]/button[contains(@class,'ListingContactDetailsButtonstyle__ButtonItem')]/a[contains(@class,'depth-listing-card-link')]"
+    AGENT_NAME_XPATH = ".//div[contains(@class,'ListingHeadingstyle__HeadingTitle')] | .//div[contains(@class,'heading-name')]"
+    POSTED_DATE_XPATH = ".//p[contains(@class,'ListingHeadingstyle__HeadingCreationDate')] | .//div[contains(@class,'BasicCardstyle__HeadingWrapper-DxbUP knxJEk')]/p[contains(@class,'heading-creation-date')]"
+    HOUSE_PRICE_XPATH = ".//li[contains(@class,'ListingPricestyle__ItemWrapper')] | .//div[contains(@class,'ListingPricestyle__RangePriceWrapper')]"
+    PRICE_SQUARE_FEET_XPATH = ".//div[contains(@class,'ListingPricestyle__PricePSFWrapper')]"
+    HOUSE_NAME_XPATH = ".//h2[contains(@class,'PremiumCardstyle__TitleWrapper')] | .//div[contains(@class,'BasicCardstyle__DescriptionWrapper-dPdKmp fRMZJr')]//h2[contains(@class,'BasicCardstyle__TitleWrapper-eNIiIX dLdNwJ')]"
+    HOUSE_LOCATION_XPATH = ".//div[contains(@class,'PremiumCardstyle__AddressWrapper')] | .//div[contains(@class,'BasicCardstyle__DescriptionWrapper-dPdKmp fRMZJr')]//div[contains(@class,'BasicCardstyle__AddressWrapper-jUpzVZ jikSUL')]"
+    PAGINATION_XPATH = "//li[contains(@class,'pagination-item')]"
+    NEXT_PAGE_XPATH = "//li[contains(@class,'pagination-item')]/a[contains(@aria-label,'Go to next page')]"
+    ATTRIBUTES_XPATH = ".//p[contains(@class,'ListingAttributesstyle__ListingAttrsDescriptionItemWrapper')]"
+
+    # Raw per-listing values collected in one pass; every column of the schema is derived from these
+    RAW_FIELDS = {
+        "Page_Link": PAGE_LINK_XPATH,
+        "Agent_Name": AGENT_NAME_XPATH,
+        "Posted_Date": POSTED_DATE_XPATH,
+        "House_Price": HOUSE_PRICE_XPATH,
+        "Price_Square_Feet": PRICE_SQUARE_FEET_XPATH,
+        "House_Name": HOUSE_NAME_XPATH,
+        "House_Location": HOUSE_LOCATION_XPATH,
+        "Attributes": ATTRIBUTES_XPATH,
+    }
+
+    # Compiled once per process for the offline (lxml) backend
+    COMPILED_LISTING_XPATH = etree.XPath(LISTING_XPATH)
+    COMPILED_PAGINATION_XPATH = etree.XPath(PAGINATION_XPATH)
+
+    # Per-variant hit rates of the union XPaths above, one registry per process (selector_registry.py)
+    selectors = SelectorRegistry({xpath: key for key, xpath in RAW_FIELDS.items()})
+
+    # Runs in the browser: evaluates every RAW_FIELDS xpath for every listing and returns them as one JSON array
+    HARVEST_SCRIPT = """
+        const listingXpath = arguments[0], fields = arguments[1], linkField = arguments[2];
+        const listings = document.evaluate(listingXpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const rows = [];
+        for (let i = 0; i < listings.snapshotLength; i++) {
+            const listing = listings.snapshotItem(i);
+            const row = {};
+            for (const [key, xpath] of Object.entries(fields)) {
+                const node = document.evaluate(xpath, listing, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                if (node === null) {
+                    row[key] = null;
+                } else if (key === linkField) {
+                    row[key] = node.href || node.getAttribute('href');
+                } else {
+                    row[key] = (node.innerText || node.textContent || '').trim();
+                }
+            }
+            rows.push(row);
+        }
+        return JSON.stringify(rows);
+    """
+
+    # Page state the site embeds for hydration: Next.js __NEXT_DATA__ or a Redux window.__INITIAL_STATE__
+    NEXT_DATA_PATTERN = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.S)
+    REDUX_STATE_PATTERN = re.compile(r'window\.__(?:INITIAL|PRELOADED)_STATE__\s*=\s*(\{.*?\})\s*;?\s*</script>', re.S)
+
+    # Candidate key paths inside one listing object of the page state, first hit wins
+    STATE_FIELDS = {
+        "Page_Link": ["shareLink", "url", "link"],
+        "Agent_Name": ["lister.name", "listers.0.name", "agent.name", "organisation.name"],
+        "Posted_Date": ["postedAt", "postedDate", "updatedAt"],
+        "House_Price": ["price.display", "prices.0.display", "prices.0", "price"],
+        "Price_Square_Feet": ["price.pricePerSizeUnit", "pricePerSizeUnit"],
+        "House_Name": ["title", "name"],
+        "House_Location": ["address.formattedAddress", "address"],
+        "Property_Type": ["propertyType", "attributes.propertyType"],
+        "Tenure": ["attributes.tenure", "tenure"],
+        "Built_Up": ["attributes.builtUp", "builtUp"],
+        "Land_Area": ["attributes.landArea", "landArea"],
+        "Furnishing": ["attributes.furnishing", "furnishing"],
+    }
+    # A listing object has an id besides its link, which breadcrumbs, agents and banners of the state lack
+    STATE_LISTING_ID = ["id", "listingId", "propertyId"]
+    # Rows without any of these are not worth keeping over the XPath parser's
+    STATE_CORE_FIELDS = ("Page_Link", "House_Price", "House_Name")
+
+    @staticmethod
+    def get_current_datetime():
+        return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    @staticmethod
+    def extract_element_text(listing, xpath):
+        if isinstance(listing, ListingContext):
+            return listing.text(xpath)
+        elements = Mapping.selectors.find_union(xpath, lambda union: listing.find_elements(By.XPATH, union))
+        return elements[0].text.strip() if elements else None
+
+    @staticmethod
+    def extract_page_link(listing):
+        if isinstance(listing, ListingContext):
+            return listing.link(Mapping.PAGE_LINK_XPATH)
+        page_link_elements = Mapping.selectors.find_union(Mapping.PAGE_LINK_XPATH, lambda union: listing.find_elements(By.XPATH, union))
+        return page_link_elements[0].get_attribute("href") if page_link_elements else None
+
+    @staticmethod
+    def parse_source(page_link):
+        if page_link is not None:
+            page_link_split = page_link.split("/")
+            return page_link_split[2].split(".")[1]
+        return None
+
+    @staticmethod
+    def parse_property_id(page_link):
+        # Same rule as Property_ID in the transform stage: the last path segment of the listing link
+        if page_link and (property_id_match := re.search(r'([^\/]+)\/?$', page_link)):
+            return property_id_match[1]
+        return None
+
+    @staticmethod
+    def extract_source(listing):
+        try:
+            return Mapping.parse_source(Mapping.extract_page_link(listing))
+        except NoSuchElementException:
+            return None
+
+    @staticmethod
+    def split_psf_element(psf_element):
+        return psf_element.split()[0].lstrip('(') + " " + psf_element.split()[1]
+
+    @staticmethod
+    def parse_price_square_feet(psf_element):
+        if psf_element:
+            return Mapping.split_psf_element(psf_element)
+        return None
+
+    @staticmethod
+    def extract_price_square_feet(listing):
+        try:
+            return Mapping.parse_price_square_feet(Mapping.extract_element_text(listing, Mapping.PRICE_SQUARE_FEET_XPATH))
+        except NoSuchElementException:
+            return None
+
+    @staticmethod
+    def parse_house_type(house_type_text):
+        if house_type_text:
+            house_type_parts = re.split(r'\||•', house_type_text)
+            return house_type_parts[0].strip()
+        return None
+
+    @staticmethod
+    def parse_lot_type(house_type_text):
+        if house_type_text and (lot_type_match := re.search(r'\|([^•]+)', house_type_text)):
+            return lot_type_match[1].strip()
+        return None
+
+    @staticmethod
+    def parse_square_footage(house_type_text):
+        if house_type_text and (sq_footage_match := re.search(r'(?i)(?:Built-up|Land\s*area)\s*:\s*(.*?)\s*sq\. ft\.', house_type_text)):
+            return sq_footage_match[1].replace(',', '')
+        return None
+
+    @staticmethod
+    def parse_house_furniture(house_type_text):
+        if house_type_text and 'furnished' in house_type_text.lower():
+            return house_type_text.rsplit('•', 1)[-1].strip()
+        return None
+
+    @staticmethod
+    def extract_house_type(listing):
+        return Mapping.parse_house_type(Mapping.extract_element_text(listing, Mapping.ATTRIBUTES_XPATH))
+
+    @staticmethod
+    def extract_lot_type(listing):
+        return Mapping.parse_lot_type(Mapping.extract_element_text(listing, Mapping.ATTRIBUTES_XPATH))
+
+    @staticmethod
+    def extract_square_footage(listing):
+        return Mapping.parse_square_footage(Mapping.extract_element_text(listing, Mapping.ATTRIBUTES_XPATH))
+
+    @staticmethod
+    def extract_house_furniture(listing):
+        return Mapping.parse_house_furniture(Mapping.extract_element_text(listing, Mapping.ATTRIBUTES_XPATH))
+
+    @staticmethod
+    def extract_text_content(listing, xpath):
+        return Mapping.extract_element_text(listing, xpath)
+
+    @staticmethod
+    def map_raw_fields(raw):
+        """Build a Page_Link...Created_At record from the raw values of one listing."""
+        attributes = raw.get("Attributes")
+        return {
+            "Page_Link": raw.get("Page_Link"),
+            "Source": Mapping.parse_source(raw.get("Page_Link")),
+            "Agent_Name": raw.get("Agent_Name"),
+            "Posted_Date": raw.get("Posted_Date"),
+            "House_Price": raw.get("House_Price"),
+            "Price_Square_Feet": Mapping.parse_price_square_feet(raw.get("Price_Square_Feet")),
+            "House_Name": raw.get("House_Name"),
+            "House_Location": raw.get("House_Location"),
+            "House_Type": Mapping.parse_house_type(attributes),
+            "Lot_Type": Mapping.parse_lot_type(attributes),
+            "Square_Footage": Mapping.parse_square_footage(attributes),
+            "House_Furniture": Mapping.parse_house_furniture(attributes),
+            "Created_At": Mapping.get_current_datetime()
+        }
+
+    @staticmethod
+    def harvest_listings(driver):
+        """Collect the raw fields of every listing on the current page with a single execute_script call."""
+        rows = driver.execute_script(Mapping.HARVEST_SCRIPT, Mapping.LISTING_XPATH, Mapping.RAW_FIELDS, "Page_Link")
+        return json.loads(rows or "[]")
+
+    @staticmethod
+    def normalize_text(text):
+        return ' '.join(text.split())
+
+    @staticmethod
+    def parse_page_source(page_source, base_url=None):
+        """Parse a page's HTML once with lxml and return the raw fields of every listing, without touching the browser."""
+        tree = lxml_html.fromstring(page_source)
+        rows = []
+        for listing in Mapping.COMPILED_LISTING_XPATH(tree):
+            row = {}
+            for key, xpath in Mapping.RAW_FIELDS.items():
+                nodes = Mapping.selectors.find(xpath, lambda variant: Mapping.selectors.compiled(variant)(listing))
+                if not nodes:
+                    row[key] = None
+                elif key == "Page_Link":
+                    href = nodes[0].get("href")
+                    row[key] = urljoin(base_url or "", href) if href else None
+                else:
+                    row[key] = Mapping.normalize_text(nodes[0].text_content())
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def parse_page_count(page_source):
+        """Highest page number in the pagination bar of a page's HTML."""
+        tree = lxml_html.fromstring(page_source)
+        page_numbers = [int(text) for item in Mapping.COMPILED_PAGINATION_XPATH(tree) if (text := item.text_content().strip()).isdigit()]
+        return max(page_numbers, default=1)
+
+    @staticmethod
+    def find_page_state(page_source):
+        """Return the embedded page state as a dict, or None when the page carries none."""
+        for pattern in (Mapping.NEXT_DATA_PATTERN, Mapping.REDUX_STATE_PATTERN):
+            if state_match := pattern.search(page_source):
+                try:
+                    return json.loads(state_match[1])
+                except ValueError:
+                    continue
+        return None
+
+    @staticmethod
+    def state_value(item, paths):
+        for path in paths:
+            value = item
+            for key in path.split('.'):
+                if isinstance(value, list) and key.isdigit() and int(key) < len(value):
+                    value = value[int(key)]
+                elif isinstance(value, dict) and key in value:
+                    value = value[key]
+                else:
+                    value = None
+                    break
+            if value not in (None, '', [], {}):
+                return value
+        return None
+
+    @staticmethod
+    def is_state_listing(item):
+        value = lambda key: Mapping.state_value(item, Mapping.STATE_FIELDS[key])
+        return (isinstance(item, dict) and isinstance(value("Page_Link"), str) and Mapping.state_value(item, Mapping.STATE_LISTING_ID) is not None
+                and (value("House_Price") is not None or value("House_Name") is not None))
+
+    @staticmethod
+    def find_state_listings(state):
+        """The listing objects of the largest list of the state that holds any (an id, a link and a price or title)."""
+        pending, listings = [state], None
+        while pending:
+            node = pending.pop()
+            if isinstance(node, list):
+                if node and all(isinstance(item, dict) for item in node):
+                    found = [item for item in node if Mapping.is_state_listing(item)]
+                    if len(found) > len(listings or []):
+                        listings = found
+                pending.extend(reversed(node))
+            elif isinstance(node, dict):
+                pending.extend(reversed(list(node.values())))
+        return listings
+
+    @staticmethod
+    def has_core_fields(rows):
+        return all(row[field] for row in rows for field in Mapping.STATE_CORE_FIELDS)
+
+    @staticmethod
+    def format_state_posted_date(value):
+        # ISO timestamps are written the way the cards show them, so 02_transform parses both sources alike
+        try:
+            posted_at = datetime.datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return str(value)
+        return f"Posted on {posted_at:%d %b %Y %I:%M} {posted_at.strftime('%p').lower()}"
+
+    @staticmethod
+    def format_state_price(value):
+        if isinstance(value, dict) and 'min' in value:
+            low, high = value.get('min'), value.get('max')
+            return f"RM {low:,.0f}" if high in (None, low) else f"RM {low:,.0f} - RM {high:,.0f}"
+        return f"RM {value:,.0f}" if isinstance(value, (int, float)) else value
+
+    @staticmethod
+    def state_to_raw(item, base_url=None):
+        """Map one listing object of the page state to the same raw fields parse_page_source returns."""
+        value = lambda key: Mapping.state_value(item, Mapping.STATE_FIELDS[key])
+        page_link = value("Page_Link")
+        posted_date = value("Posted_Date")
+        price = value("House_Price")
+        price_square_feet = value("Price_Square_Feet")
+        address = value("House_Location")
+        built_up, land_area = value("Built_Up"), value("Land_Area")
+        size = f"Built-up : {built_up:,} sq. ft." if built_up else f"Land area : {land_area:,} sq. ft." if land_area else None
+        heading = ' | '.join(str(part) for part in (value("Property_Type"), value("Tenure")) if part)
+        attributes = ' • '.join(part for part in (heading, size, value("Furnishing")) if part)
+        return {
+            "Page_Link": urljoin(base_url or "", page_link) if page_link else None,
+            "Agent_Name": value("Agent_Name"),
+            "Posted_Date": Mapping.format_state_posted_date(posted_date) if posted_date else None,
+            "House_Price": Mapping.format_state_price(price) if price is not None else None,
+            "Price_Square_Feet": f"(RM {price_square_feet:,.2f} psf)" if isinstance(price_square_feet, (int, float)) else price_square_feet,
+            "House_Name": value("House_Name"),
+            "House_Location": address.get("formattedAddress") if isinstance(address, dict) else address,
+            "Attributes": attributes or None,
+        }
+
+    @staticmethod
+    def parse_listing_responses(bodies, base_url=None):
+        """Raw fields of every listing in the captured XHR/JSON responses, once per Page_Link; [] when some miss core fields."""
+        rows, seen_links = [], set()
+        for body in bodies:
+            for item in Mapping.find_state_listings(body) or []:
+                row = Mapping.state_to_raw(item, base_url)
+                if row["Page_Link"] not in seen_links:
+                    seen_links.add(row["Page_Link"])
+                    rows.append(row)
+        return rows if Mapping.has_core_fields(rows) else []
+
+    @staticmethod
+    def first_card_link(page_source, base_url=None):
+        """Page_Link of the first listing card in a page's HTML, None when it has no card."""
+        for listing in Mapping.COMPILED_LISTING_XPATH(lxml_html.fromstring(page_source))[:1]:
+            for node in Mapping.selectors.compiled(Mapping.PAGE_LINK_XPATH)(listing)[:1]:
+                if href := node.get("href"):
+                    return urljoin(base_url or "", href)
+        return None
+
+    @staticmethod
+    def state_matches_cards(rows, page_source, base_url=None):
+        # The state is embedded when the document loads; after a client-side (Next button) navigation it still
+        # describes the first page while the cards show the current one
+        same_link = lambda link: (link or "").rstrip('/')
+        return same_link(rows[0]["Page_Link"]) == same_link(Mapping.first_card_link(page_source, base_url))
+
+    @staticmethod
+    def parse_page_state(page_source, base_url=None, fresh_document=True):
+        """Read the listings from the embedded page state; fall back to the XPath parser when there is none, it lacks core
+        fields, or (fresh_document=False, the page may have been reached in-page) it describes other cards than the HTML."""
+        if (state := Mapping.find_page_state(page_source)) is not None and (listings := Mapping.find_state_listings(state)):
+            rows = [Mapping.state_to_raw(item, base_url) for item in listings]
+            if Mapping.has_core_fields(rows) and (fresh_document or Mapping.state_matches_cards(rows, page_source, base_url)):
+                return rows
+        return Mapping.parse_page_source(page_source, base_url)
+
+    @staticmethod
+    def load_selector_stats(stats_file):
+        # Parse pool initializer: spawned processes start with an empty registry, without the winners of earlier runs
+        Mapping.selectors.load(stats_file)
+
+    @staticmethod
+    def parse_in_pool(parse, page_source, base_url=None):
+        """Run parse in a parse pool process and return its rows with the selector counts of that process."""
+        return parse(page_source, base_url), Mapping.selectors.drain()
+
+class ListingContext:
+    """One listing's WebElement plus the text and links already read from it, so each DOM node is fetched once."""
+    def __init__(self, listing):
+        self.listing = listing
+        self.texts = {}
+        self.links = {}
+
+    def text(self, xpath):
+        if xpath not in self.texts:
+            self.texts[xpath] = Mapping.extract_element_text(self.listing, xpath)
+        return self.texts[xpath]
+
+    def link(self, xpath):
+        if xpath not in self.links:
+            elements = Mapping.selectors.find_union(xpath, lambda union: self.listing.find_elements(By.XPATH, union))
+            self.links[xpath] = elements[0].get_attribute("href") if elements else None
+        return self.links[xpath]
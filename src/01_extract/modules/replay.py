@@ -0,0 +1,41 @@
+import json
+
+class ReplayDriver:
+    """Stands in for a Chrome driver with performance logging, serving a recorded page from a JSON file.
+
+    The recording holds the page URL, its HTML, the performance log entries and the response bodies Chrome
+    returned for Network.getResponseBody, so Setup.listing_responses and the 'xhr' mode run offline.
+    """
+    def __init__(self, recording_file):
+        with open(recording_file, 'r', encoding='utf-8') as json_file:
+            recording = json.load(json_file)
+        self.current_url = recording["url"]
+        self.page_source = recording.get("page_source", "")
+        self.log = recording["log"]
+        self.bodies = recording["bodies"]
+        self.webdriver_calls = 0
+
+    def get_log(self, log_type):
+        # Like Chrome, the log is drained by reading it
+        self.webdriver_calls += 1
+        entries, self.log = self.log, []
+        return entries
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self.webdriver_calls += 1
+        return self.bodies[cmd_args["requestId"]]
+
+    def quit(self):
+        pass
+
+    @staticmethod
+    def record(driver, recording_file):
+        """Save what a live driver with performance logging has seen since its last get_log as a recording."""
+        log, bodies = driver.get_log("performance"), {}
+        for entry in log:
+            message = json.loads(entry["message"])["message"]
+            if message["method"] == "Network.responseReceived" and "json" in message["params"]["response"].get("mimeType", ""):
+                request_id = message["params"]["requestId"]
+                bodies[request_id] = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        with open(recording_file, 'w', encoding='utf-8') as json_file:
+            json.dump({"url": driver.current_url, "page_source": driver.page_source, "log": log, "bodies": bodies}, json_file, indent=1)
@@ -0,0 +1,98 @@
+import csv, os, threading
+
+# Modules
+from .mapping import Mapping
+
+class OutputHandler:
+    """Append-only CSV writer that de-duplicates rows against an in-memory key set instead of re-reading the file."""
+    def __init__(self, config):
+        self.config = config
+        self.output_csv_file = None
+        self.csv_file = None
+        self.csv_writer = None
+        self.headers = []
+        self.seen_rows = set()
+        self.dedupe_by_property_id = False  # set when several page workers write into the same file
+        self.lock = threading.RLock()
+
+    @staticmethod
+    def normalize_value(value):
+        # Same clean-up the pandas save used to do: '' -> 'NULL', then strip and lowercase every string
+        if value is None:
+            return ''
+        if isinstance(value, str):
+            return ('NULL' if value == '' else value).strip().lower()
+        return str(value)
+
+    def row_key(self, row):
+        if self.dedupe_by_property_id and (property_id := Mapping.parse_property_id(row[self.headers.index("Page_Link")])):
+            return property_id
+        return tuple(row)
+
+    def open(self, output_csv_file, headers):
+        with self.lock:
+            if self.csv_file is not None:
+                return
+            self.output_csv_file = output_csv_file
+            self.headers = list(headers)
+            self.seen_rows = {self.row_key(row) for row in self.read_rows(output_csv_file)}
+            write_header = not os.path.exists(output_csv_file) or os.path.getsize(output_csv_file) == 0
+            self.csv_file = open(output_csv_file, 'a', newline='', encoding='utf-8')
+            self.csv_writer = csv.writer(self.csv_file)
+            if write_header:
+                self.csv_writer.writerow(self.headers)
+
+    @property
+    def offset(self):
+        # Bytes of complete rows in the file, recorded by checkpoints
+        with self.lock:
+            return self.csv_file.tell() if self.csv_file is not None else 0
+
+    @staticmethod
+    def truncate(output_csv_file, offset):
+        """Cut rows written after the last checkpoint (possibly half a row) before resuming."""
+        if offset and os.path.exists(output_csv_file) and os.path.getsize(output_csv_file) > offset:
+            with open(output_csv_file, 'r+b') as csv_file:
+                csv_file.truncate(offset)
+
+    def read_rows(self, output_csv_file):
+        if not os.path.exists(output_csv_file):
+            return []
+        with open(output_csv_file, 'r', newline='', encoding='utf-8') as csv_file:
+            rows = list(csv.reader(csv_file))
+        return rows[1:]
+
+    def save_data_to_csv(self, data):
+        with self.lock:
+            for item in data:
+                row = [self.normalize_value(item.get(header)) for header in self.headers]
+                key = self.row_key(row)
+                if key in self.seen_rows:
+                    continue
+                self.seen_rows.add(key)
+                self.csv_writer.writerow(row)
+            self.csv_file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.csv_file is not None:
+                self.csv_file.close()
+                self.csv_file = None
+                self.csv_writer = None
+
+    def compact(self):
+        """Rewrite the file once at the end of a run, keeping the first occurrence of every row (or Property_ID)."""
+        self.close()
+        if self.output_csv_file is None:
+            return
+        seen, rows = set(), []
+        for row in self.read_rows(self.output_csv_file):
+            if (key := self.row_key(row)) not in seen:
+                seen.add(key)
+                rows.append(row)
+        temp_file = f"{self.output_csv_file}.tmp"
+        with open(temp_file, 'w', newline='', encoding='utf-8') as csv_file:
+            csv_writer = csv.writer(csv_file)
+            csv_writer.writerow(self.headers)
+            csv_writer.writerows(rows)
+        os.replace(temp_file, self.output_csv_file)
@@ -0,0 +1,59 @@
+import os, json, time, queue, threading
+
+class RegionScheduler:
+    """Runs regions on a fixed pool of workers; a worker picks up the next region as soon as it is free.
+
+    Regions are queued longest-first using the durations recorded by previous runs, so a slow region such as
+    Selangor starts early instead of holding up the tail of the crawl. Regions with no history are queued first.
+    """
+    def __init__(self, run_region, workers, durations_file):
+        self.run_region = run_region  # callable(script_number, region, worker_number)
+        self.workers = workers
+        self.durations_file = durations_file
+        self.durations = self.load_durations()
+        self.lock = threading.Lock()
+
+    def load_durations(self):
+        if not os.path.exists(self.durations_file):
+            return {}
+        with open(self.durations_file, 'r') as json_file:
+            return json.load(json_file)
+
+    def save_durations(self):
+        with open(self.durations_file, 'w') as json_file:
+            json.dump(self.durations, json_file, indent=4, sort_keys=True)
+
+    def order_regions(self, regions):
+        return sorted(regions, key=lambda item: self.durations.get(item[1], float('inf')), reverse=True)
+
+    def worker(self, worker_number, pending):
+        while True:
+            try:
+                script_number, region = pending.get_nowait()
+            except queue.Empty:
+                return
+            print(f"Worker {worker_number} running region {script_number}: {region}")
+            start_time = time.time()
+            try:
+                self.run_region(script_number, region, worker_number)
+            except Exception as e:
+                print(f"Region {region} failed: {e}")
+                continue
+            execution_time = time.time() - start_time
+            print(f"Region {script_number}: {region} executed in {execution_time} seconds.")
+            with self.lock:
+                self.durations[region] = execution_time
+
+    def run(self, regions):
+        pending = queue.Queue()
+        for item in self.order_regions(regions):
+            pending.put(item)
+        threads = [
+            threading.Thread(target=self.worker, args=(worker_number, pending), name=f"worker{worker_number}")
+            for worker_number in range(1, min(self.workers, len(regions)) + 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.save_durations()
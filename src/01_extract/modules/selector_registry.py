@@ -0,0 +1,141 @@
+import os, json, threading
+from datetime import datetime
+from lxml import etree
+
+class SelectorRegistry:
+    """The union XPaths of Mapping split into their variants (Premium and Basic card markup), the one that matches most tried first.
+
+    A listing card matches one variant, so the winner alone is often a single short lookup. When it misses, the
+    remaining variants are tried as one union and then one by one to find the match.
+    Hits per variant are kept across runs in a JSON file; report() names variants that used to match but matched
+    nothing this run, and fields that no variant matches on most listings.
+
+    That pays off where a lookup is cheap (lxml). Over WebDriver every lookup is a round trip, and a page mixes
+    card types that each match a different variant, so find_union() evaluates the whole union once and only
+    counts the field's lookups and misses.
+    """
+    MIN_LOOKUPS = 20  # listings looked up before a field is reported
+
+    def __init__(self, names=None):
+        self.names = names or {}  # union xpath -> field name, for the report
+        self.variants = {}  # union xpath -> its variants, most hits first
+        self.compiled_xpaths = {}
+        self.history = {}  # variant -> {"hits": ..., "last_hit": ...} of earlier runs
+        self.counts = self.empty_counts()  # since the last save
+        self.loaded_file = None
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def empty_counts():
+        # hits per variant, lookups and misses (no variant matched) per union xpath
+        return {"hits": {}, "lookups": {}, "misses": {}}
+
+    def ordered(self, xpath):
+        if xpath not in self.variants:
+            variants = [variant.strip() for variant in xpath.split(' | ')]
+            self.variants[xpath] = sorted(variants, key=lambda variant: -self.history.get(variant, {}).get("hits", 0))
+        return self.variants[xpath]
+
+    def compiled(self, xpath):
+        if xpath not in self.compiled_xpaths:
+            self.compiled_xpaths[xpath] = etree.XPath(xpath)
+        return self.compiled_xpaths[xpath]
+
+    def count_lookup(self, xpath, matched):
+        # Called with the lock held
+        lookups, misses = self.counts["lookups"], self.counts["misses"]
+        lookups[xpath] = lookups.get(xpath, 0) + 1
+        if not matched:
+            misses[xpath] = misses.get(xpath, 0) + 1
+
+    def record(self, xpath, variant):
+        with self.lock:
+            self.count_lookup(xpath, variant is not None)
+            if variant is None:
+                return
+            hits = self.counts["hits"]
+            hits[variant] = hits.get(variant, 0) + 1
+            variants = self.variants[xpath]
+            position = variants.index(variant)
+            if position and hits[variant] > hits.get(variants[position - 1], 0):
+                # Replaced rather than sorted in place, other threads may be iterating the old order
+                self.variants[xpath] = sorted(variants, key=lambda other: -hits.get(other, 0))
+
+    def find(self, xpath, evaluate):
+        """evaluate(variant) for the winning variant first; None when no variant matches."""
+        winner, *others = self.ordered(xpath)
+        if result := evaluate(winner):
+            self.record(xpath, winner)
+            return result
+        if not others or not evaluate(' | '.join(others)):
+            self.record(xpath, None)
+            return None
+        # The winner changed on this card: find out which variant matched it
+        for variant in others:
+            if result := evaluate(variant):
+                self.record(xpath, variant)
+                return result
+
+    def find_union(self, xpath, evaluate):
+        """evaluate(xpath) once, for the whole union; which variant matched is not recorded."""
+        result = evaluate(xpath)
+        with self.lock:
+            self.count_lookup(xpath, bool(result))
+        return result
+
+    def drain(self):
+        """Counts since the last drain; parse pool processes hand theirs back with the parsed rows."""
+        with self.lock:
+            counts, self.counts = self.counts, self.empty_counts()
+        return counts
+
+    def merge(self, counts):
+        with self.lock:
+            for key, values in counts.items():
+                for name, count in values.items():
+                    self.counts[key][name] = self.counts[key].get(name, 0) + count
+
+    def load(self, stats_file):
+        with self.lock:
+            if self.loaded_file == stats_file:
+                return
+            self.loaded_file = stats_file
+            if os.path.exists(stats_file):
+                with open(stats_file, 'r') as json_file:
+                    self.history = json.load(json_file)
+            self.variants.clear()  # reordered from the history on next use
+
+    def report(self):
+        """Print the fields and variants that stopped matching since the last save."""
+        with self.lock:
+            hits, lookups, misses = (dict(self.counts[key]) for key in ("hits", "lookups", "misses"))
+        for xpath, looked_up in lookups.items():
+            if looked_up < self.MIN_LOOKUPS:
+                continue
+            name = self.names.get(xpath, xpath)
+            if misses.get(xpath, 0) * 2 > looked_up:
+                print(f"Selector check: {name} matched nothing on {misses[xpath]} of {looked_up} listings")
+            variants = self.ordered(xpath)
+            if not any(hits.get(variant) for variant in variants):
+                continue  # looked up with find_union only, or missed everywhere (reported above)
+            for variant in variants:
+                if not hits.get(variant) and (stats := self.history.get(variant)):
+                    print(f"Selector check: {name} variant last matched on {stats['last_hit']}, not this run: {variant}")
+
+    def save(self, stats_file):
+        # Re-read first, other scraper processes may have saved since this one loaded
+        history = {}
+        if os.path.exists(stats_file):
+            with open(stats_file, 'r') as json_file:
+                history = json.load(json_file)
+        today = datetime.now().strftime("%Y-%m-%d")
+        for variant, hits in self.drain()["hits"].items():
+            stats = history.setdefault(variant, {"hits": 0, "last_hit": None})
+            stats["hits"] += hits
+            stats["last_hit"] = today
+        os.makedirs(os.path.dirname(stats_file), exist_ok=True)
+        temp_file = f"{stats_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_file, 'w') as json_file:
+            json.dump(history, json_file, indent=4, sort_keys=True)
+        os.replace(temp_file, stats_file)
+        self.history = history
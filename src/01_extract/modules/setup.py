@@ -0,0 +1,139 @@
+import re, json, base64
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium_stealth import stealth
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+class Setup:
+    chrome_driver_file = None
+
+    # Listing photos, fonts, media and analytics are never used by the extractor
+    DEFAULT_BLOCKED_URLS = [
+        "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+        "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*", "*tiktok.com*", "*criteo.*",
+    ]
+
+    # Requests since the last call and the last full page load time. Its bytes are only a fallback for a browser
+    # without the performance log: transferSize is 0 for cross-origin resources without Timing-Allow-Origin,
+    # the CDN images and trackers that blocking removes among them
+    PAGE_METRICS_SCRIPT = """
+        const navigation = performance.getEntriesByType('navigation')[0];
+        const resources = performance.getEntriesByType('resource');
+        const resourceBytes = resources.reduce((total, entry) => total + (entry.transferSize || 0), 0);
+        const freshDocument = navigation && !window.__pageMetricsSeen;  // false after in-page (Next button) navigation
+        window.__pageMetricsSeen = true;
+        performance.clearResourceTimings();
+        return {
+            bytes: resourceBytes + (freshDocument ? navigation.transferSize : 0),
+            requests: resources.length,
+            load_ms: freshDocument ? navigation.loadEventEnd - navigation.startTime : null
+        };
+    """
+
+    def __init__(self, chrome_driver_file):
+        self.chrome_driver_file = chrome_driver_file
+        chrome_options = Setup.setup_driver()
+        self.driver = Setup.instantiate_browser(self.chrome_driver_file, chrome_options)
+
+    @staticmethod
+    def setup_driver(chrome_binary=None, performance_log=False):
+        options = ChromeOptions()
+        if chrome_binary:
+            options.binary_location = chrome_binary  # e.g. chrome-headless-shell on the Linux server
+        if performance_log:
+            # Network events end up in driver.get_log('performance'), see network_events
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_argument('--headless')  # Enable headless mode
+        options.add_argument('--disable-gpu')  # This option is necessary for headless mode
+        options.add_argument('--no-sandbox')  # This option is often necessary if you run under a UNIX system
+        options.add_argument('--disable-dev-shm-usage')  # Overcome limited resource problems
+        options.add_argument('--disable-extensions')
+        # Background tabs keep loading at full speed when pages are prefetched in tabs (TAB_DEPTH)
+        options.add_argument('--disable-background-timer-throttling')
+        options.add_argument('--disable-renderer-backgrounding')
+        options.add_argument('--disable-backgrounding-occluded-windows')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        # stealth(options)
+        return options
+
+    @staticmethod
+    def instantiate_browser(chrome_driver_file, chrome_options):
+        service = ChromeService(chrome_driver_file)
+        web_driver = webdriver.Chrome(service=service, options=chrome_options)
+        Setup.configure_stealth(web_driver)
+        return web_driver
+
+    @staticmethod
+    def block_resources(driver, blocked_urls):
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_urls})
+
+    @staticmethod
+    def network_events(driver):
+        """DevTools messages of the performance log since the last call, None when the browser keeps none.
+
+        Reading drains the log, so it is read once per page.
+        """
+        try:
+            return [json.loads(entry["message"])["message"] for entry in driver.get_log("performance")]
+        except WebDriverException:
+            return None
+
+    @staticmethod
+    def listing_responses(driver, url_pattern, network_events=None):
+        """JSON bodies of the responses whose URL matches url_pattern, received since the last call (or in network_events)."""
+        bodies = []
+        for message in Setup.network_events(driver) if network_events is None else network_events:
+            if message["method"] != "Network.responseReceived":
+                continue
+            response = message["params"]["response"]
+            if "json" not in response.get("mimeType", "") or not re.search(url_pattern, response["url"]):
+                continue
+            try:
+                body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": message["params"]["requestId"]})
+                bodies.append(json.loads(base64.b64decode(body["body"]) if body.get("base64Encoded") else body["body"]))
+            except (WebDriverException, ValueError):
+                continue  # evicted from Chrome's buffer or not JSON after all
+        return bodies
+
+    @staticmethod
+    def page_metrics(driver, network_events=None):
+        """Bytes and requests of the page, from the encoded sizes Chrome reports in network_events when there are any."""
+        try:
+            metrics = driver.execute_script(Setup.PAGE_METRICS_SCRIPT)
+        except Exception:
+            return None
+        if metrics is not None and network_events is not None:
+            # Over the wire, every origin included; blocked requests fail and never finish loading
+            finished = [message["params"] for message in network_events if message["method"] == "Network.loadingFinished"]
+            metrics["bytes"] = sum(params.get("encodedDataLength", 0) for params in finished)
+            metrics["requests"] = len(finished)
+        return metrics
+
+    @staticmethod
+    def wait_for_element(driver, timeout, xpath):
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, xpath))
+        )
+
+    @staticmethod
+    def configure_stealth(driver):
+        stealth(driver,
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/83.0.4103.53 Safari/537.36',
+            languages=["en-US", "en"],
+            vendor="Google Inc.",
+            platform="Win32",
+            webgl_vendor="Intel Inc.",
+            renderer="Intel Iris OpenGL Engine",
+            fix_hairline=True,
+            run_on_insecure_origins=False,
+            window_name="my_custom_window"
+        )
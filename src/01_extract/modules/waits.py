@@ -0,0 +1,88 @@
+import time
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# Modules
+from .mapping import Mapping
+
+class AdaptiveWait:
+    """Event-driven waits: return as soon as the page is ready, with timeouts tuned from the latencies seen so far."""
+    LISTING_CONTAINER_XPATH = "//ul[contains(@class,'ListingsListstyle__ListingsListContainer')]"
+
+    def __init__(self, driver, min_timeout, max_timeout, region=None):
+        self.driver = driver
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.region = region
+        self.latencies = []  # every successful wait, used to tune the timeout
+        self.page_waits = []  # total seconds waited per page
+        self.page_bytes = []  # bytes transferred per page, when the browser reports them
+        self.current_page_wait = 0.0
+
+    @property
+    def timeout(self):
+        # Until there is some history, be as patient as the old fixed sleeps; then allow 3x the p95 latency
+        if len(self.latencies) < 5:
+            return self.max_timeout
+        p95 = sorted(self.latencies)[int(len(self.latencies) * 0.95) - 1]
+        return min(self.max_timeout, max(self.min_timeout, 3 * p95))
+
+    def until(self, condition):
+        start_time = time.perf_counter()
+        try:
+            result = WebDriverWait(self.driver, self.timeout, poll_frequency=0.2).until(condition)
+            self.latencies.append(time.perf_counter() - start_time)
+            return result
+        finally:
+            self.current_page_wait += time.perf_counter() - start_time
+
+    def for_listings(self):
+        return self.until(EC.presence_of_element_located((By.XPATH, self.LISTING_CONTAINER_XPATH)))
+
+    def for_next_page_button(self):
+        try:
+            return self.until(EC.presence_of_element_located((By.XPATH, Mapping.NEXT_PAGE_XPATH)))
+        except TimeoutException:
+            return None
+
+    def for_clickable(self, by, value):
+        return self.until(EC.element_to_be_clickable((by, value)))
+
+    def for_page_change(self, old_url, old_listing):
+        """Wait until the first listing of the previous page is detached, then for the new listings.
+
+        The URL can advance (history.pushState) while the old cards are still on screen, so it only counts
+        when the previous page had no listing to watch.
+        """
+        def page_changed(driver):
+            if old_listing is None:
+                return driver.current_url != old_url
+            try:
+                return EC.staleness_of(old_listing)(driver)
+            except StaleElementReferenceException:
+                return True
+        self.until(page_changed)
+        return self.for_listings()
+
+    def finish_page(self, url, metrics=None):
+        self.page_waits.append(self.current_page_wait)
+        message = f"[{self.region}] waited {self.current_page_wait:.2f}s for {url}"
+        if metrics:
+            self.page_bytes.append(metrics["bytes"])
+            message += f", {metrics['bytes'] / 1024:.0f} KB in {metrics['requests']} requests"
+            if metrics.get("load_ms"):
+                message += f", document load {metrics['load_ms']:.0f} ms"
+        print(message)
+        self.current_page_wait = 0.0
+
+    def report(self):
+        if not self.page_waits:
+            return
+        total_wait = sum(self.page_waits)
+        print(f"[{self.region}] {len(self.page_waits)} pages, {total_wait:.1f}s waiting in total, "
+              f"{total_wait / len(self.page_waits):.2f}s per page, current timeout {self.timeout:.1f}s")
+        if self.page_bytes:
+            print(f"[{self.region}] {sum(self.page_bytes) / 1048576:.1f} MB transferred, "
+                  f"{sum(self.page_bytes) / len(self.page_bytes) / 1024:.0f} KB per page")
@@ -0,0 +1,64 @@
+import argparse, glob, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+from dotenv import load_dotenv
+
+# Rebuild raw CSVs from the HTML archives written with ARCHIVE_PAGES=true, through the current Mapping,
+# without touching the network. Useful after fixing XPaths for a site redesign.
+#   python reparse.py                                   # every archive in ARCHIVE_DIR
+#   python reparse.py data/archive/batch1_01_*.html.gz --workers 8 --out-dir /tmp/raw
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from modules.archive import SnapshotArchive
+from modules.mapping import Mapping
+from modules.save import OutputHandler
+
+def parse_snapshot(archive_file, entry):
+    """Records of one archived page, stamped with the time the page was fetched rather than now."""
+    records = []
+    # Archived click-mode pages were reached in-page, so their page state is checked against their cards
+    for raw in Mapping.parse_page_state(SnapshotArchive.read_page(archive_file, entry), entry["url"], fresh_document=False):
+        record = Mapping.map_raw_fields(raw)
+        record["Created_At"] = entry["fetched_at"]
+        records.append(record)
+    return records
+
+def csv_name(archive_file):
+    name = os.path.basename(archive_file)
+    for extension in (".html.gz", ".html.zst"):
+        name = name.removesuffix(extension)
+    return f"{name}.csv"
+
+def reparse(archive_file, out_dir, pool):
+    entries = SnapshotArchive.read_index(archive_file)
+    output_csv_file = os.path.join(out_dir, csv_name(archive_file))
+    if os.path.exists(output_csv_file):
+        os.remove(output_csv_file)
+    output_handler = OutputHandler(None)
+    output_handler.dedupe_by_property_id = True  # a listing that moved between pages is kept once
+    output_handler.open(output_csv_file, Mapping.map_raw_fields({}).keys())  # same columns as the extractor
+    listings = 0
+    for records in pool.map(parse_snapshot, [archive_file] * len(entries), entries, chunksize=8):
+        output_handler.save_data_to_csv(records)
+        listings += len(records)
+    output_handler.close()
+    print(f"{os.path.basename(archive_file)}: {len(entries)} pages, {listings} listings -> {output_csv_file}")
+
+if __name__ == "__main__":
+    load_dotenv(os.path.join(os.getcwd(), '../../.env'))
+    parser = argparse.ArgumentParser(description="Rebuild raw CSVs from archived page HTML")
+    parser.add_argument("archives", nargs="*", help="archive files (default: every archive in ARCHIVE_DIR)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out-dir", help="where the CSVs go (default: RAW_DIR)")
+    args = parser.parse_args()
+
+    archive_dir = os.path.join(os.getenv("MAIN_DIR", ""), os.getenv("ARCHIVE_DIR", os.path.join("data", "archive")))
+    archives = args.archives or sorted(glob.glob(os.path.join(archive_dir, "*.html.gz")) + glob.glob(os.path.join(archive_dir, "*.html.zst")))
+    if not archives:
+        sys.exit(f"No archives found in {archive_dir}")
+    out_dir = args.out_dir or os.path.join(os.getenv("MAIN_DIR"), os.getenv("RAW_DIR"))
+    os.makedirs(out_dir, exist_ok=True)
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for archive_file in archives:
+            reparse(archive_file, out_dir, pool)
+    print(f"Reparsed {len(archives)} archives in {time.time() - start_time:.1f} seconds.")
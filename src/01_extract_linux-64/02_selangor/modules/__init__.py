@@ -1 +0,0 @@
-# This __init__.py file makes the 'modules' directory a Python package.
@@ -1,4 +1,5 @@
-import pandas as pd, re, os, glob, functools, json, sys
+import pandas as pd, numpy as np, re, os, glob, functools, json, sys, time, shutil
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -29,6 +30,16 @@ class Config:
     def create_folders(self):
         os.makedirs(self.staging_dir, exist_ok=True)
 
+    @property
+    def transform_workers(self):
+        # Raw CSVs transformed at the same time, one process each; 1 transforms them one after another in this process
+        return int(os.getenv('TRANSFORM_WORKERS', str(os.cpu_count())))
+
+    @property
+    def transform_chunk_rows(self):
+        # Rows read, transformed and appended to staging_data.csv at a time; 0 reads every raw CSV whole
+        return int(os.getenv('TRANSFORM_CHUNK_ROWS', '0'))
+
     @functools.cached_property
     def csv_files(self):
         csv_file_pattern = os.path.join(self.out_dir, '*.csv')
@@ -59,11 +70,11 @@ class DataCleaner:
                 return pd.NA
 
     @staticmethod
-    def clean_posted_date(date_str):
+    def clean_posted_date(date_str, now=None):
         if not isinstance(date_str, str) or not date_str.strip():
             return None  # return None if date_str is not valid
 
-        now = datetime.now()
+        now = now or datetime.now()  # today and yesterday are relative to this
 
         if 'today' in date_str:
             if time_str := re.search(r'(\d{2}:\d{2} [ap]m)', date_str):
@@ -87,16 +98,76 @@ class DataCleaner:
                     return None  # return None if date_str is not valid
         return None  # return None if date_str is not valid
 
+    @staticmethod
+    def clean_posted_dates(posted_dates, now, cache=None):
+        """clean_posted_date over a whole column: every distinct string parsed once, all against the same `now`."""
+        cache = {} if cache is None else cache  # date string -> datetime, only valid for this `now`
+        codes, uniques = pd.factorize(posted_dates)
+        for date_str in uniques:
+            if date_str not in cache:
+                cache[date_str] = DataCleaner.clean_posted_date(date_str, now)
+        dates = pd.to_datetime(pd.Series([cache[date_str] for date_str in uniques], dtype=object)).to_numpy()
+        return pd.Series(np.append(dates, np.datetime64('NaT'))[codes], index=posted_dates.index)  # code -1 (missing) -> NaT
+
     @staticmethod
     def clean_and_capitalize(text):
         if not isinstance(text, str):
             return text
         return ' '.join(word.capitalize() for word in re.sub(r'\s{2,}|\t', ' ', text).replace('-', ' ').strip().split())
 
+    @staticmethod
+    def clean_text_column(column, replacements=None):
+        """clean_and_capitalize, then the regex replacements, once per distinct value; categorical when values repeat."""
+        codes, uniques = pd.factorize(column)
+        cleaned = pd.Series([DataCleaner.clean_and_capitalize(value) for value in uniques], dtype=object).astype('str')
+        if replacements:
+            cleaned = cleaned.replace(replacements, regex=True)
+        cleaned_codes, categories = pd.factorize(cleaned)  # different raw values can clean to the same text
+        values = pd.Categorical.from_codes(np.append(cleaned_codes, -1)[codes], categories=categories)  # code -1 stays missing
+        if len(categories) * 2 > len(column):
+            values = np.asarray(values, dtype=object)  # mostly distinct values are smaller as plain strings
+        return pd.Series(values, index=column.index)
+
     @staticmethod
     def replace_start_nan(x):
         return '' if isinstance(x, str) and x[:3].lower() == 'nan' else x
 
+    @staticmethod
+    def parse_price_values(prices):
+        """calculate_mid_value over a Series of comma-free prices: middle of a "low-high" range, plain digits as they are."""
+        price_range = prices.str.extract(r'^([^-]*)-([^-]*)$')
+        mid_value = (pd.to_numeric(price_range[0].str.strip(), errors='coerce') + pd.to_numeric(price_range[1].str.strip(), errors='coerce')) / 2
+        single = pd.to_numeric(prices.where(prices.str.isdigit()), errors='coerce')
+        return np.where(prices.str.contains('-', regex=False), mid_value, single).astype('float')
+
+    @staticmethod
+    def normalize_house_price(house_price, house_type):
+        """Numeric House_Price in one vectorized pass, same rules as the row-wise filters below.
+
+        The string work runs once per distinct price; House_Type only decides per row whether the filtered value is used.
+        """
+        codes, uniques = pd.factorize(house_price)
+        prices = pd.Series(uniques, dtype='string').str.replace('rm ', '', regex=False).str.replace('from ', '', regex=False)
+        commas = prices.str.count(',')
+        digits = prices.str.replace(r'\D', '', regex=True)
+        zero_trail = digits.str[-3:] == '000'
+        # The three filters never apply to the same value: the first two need exactly two commas and differ on the
+        # trailing zeros, the third needs three or more, and remove_digits keeps the commas, so all three read the input
+        remove_digits = (commas == 2) & (digits.str.len() == 9) & ~zero_trail  # skipped for Residential Land and Bungalow
+        nine_digits_trail = (commas == 2) & (digits.str.len() == 9) & zero_trail  # skipped for Residential Land and Bungalow
+        three_comma = (commas >= 3) & (digits.str.len() >= 9) & zero_trail  # skipped for Residential Land
+        filtered = prices.mask(remove_digits, prices.str.replace(',000', ',0', n=1, regex=False))
+        filtered = filtered.mask(nine_digits_trail | three_comma, prices.str[:-4])
+
+        # Per distinct price: value without and with its filter, plus one NaN slot for missing prices (code -1)
+        plain_values = np.append(DataCleaner.parse_price_values(prices.str.replace(',', '', regex=False)), np.nan)
+        filtered_values = np.append(DataCleaner.parse_price_values(filtered.str.replace(',', '', regex=False)), np.nan)
+        exempt = house_type.isin(['Residential Land', 'Bungalow']).to_numpy()
+        land = house_type.isin(['Residential Land']).to_numpy()
+        use_filter = (((remove_digits | nine_digits_trail).to_numpy()[codes] & ~exempt) | (three_comma.to_numpy()[codes] & ~land)) & (codes >= 0)
+        return pd.Series(np.where(use_filter, filtered_values[codes], plain_values[codes]), index=house_price.index)
+
+    # Row-wise reference of normalize_house_price, benchmark.py checks the two agree
     @staticmethod
     def calculate_mid_value(price_range_str):
         if '-' in price_range_str:
@@ -200,25 +271,27 @@ class SchemaHandler:
         return df
 
 class DataTransformer:
+    REPLACEMENTS = {
+        r'\bHomes\b': 'House',
+        r'\bSty\b': 'Storey',
+        r'\blink\b': 'Link'
+    }
+
     def __init__(self, schema):
         self.schema = schema
+        self.run_started = datetime.now()  # "posted today" means the day this run started, for every file
+        self.posted_dates = {}  # clean_posted_dates cache, shared by every file of the run
 
     def transform_data(self, df, file_name):
         df = df.copy()
         df = df[~df['House_Price'].str.contains('contact', case=False, na=False)] # Remove all rows with 'contact for detail' in House_Price
         df.loc[:, 'Property_ID'] = df['Page_Link'].str.extract(r'([^\/]+)\/?$').astype('str')
         df.loc[:, 'Area'] = df['Page_Link'].str.extract(r'/property/([^\/]+)/').astype('str')
-        df.loc[:, 'Square_Footage'] = df['Square_Footage'].apply(DataCleaner.clean_square_footage)
-        df.loc[:, 'Posted_Date'] = pd.to_datetime(df['Posted_Date'].apply(DataCleaner.clean_posted_date))
-        df.loc[:, 'Posted_Date'] = df.dropna(subset=['Posted_Date'])
-        df.loc[:, 'House_Price'] = df['House_Price'].replace(r'rm ', '', regex=True)
-        df.loc[:, 'House_Price'] = df['House_Price'].replace(r'from ', '', regex=True)
-        df.loc[:, 'House_Price'] = df.apply(DataCleaner.is_land_or_bungalow1, axis=1)
-        df.loc[:, 'House_Price'] = df.apply(DataCleaner.is_land_or_bungalow2, axis=1)
-        df.loc[:, 'House_Price'] = df.apply(DataCleaner.check_land, axis=1)
-        df.loc[:, 'House_Price'] = df['House_Price'].replace(r',', '', regex=True)
-        df.loc[:, 'House_Price'] = df['House_Price'].apply(DataCleaner.calculate_mid_value)
-        df.loc[:, 'House_Price'] = df['House_Price'].astype('float')
+        # Always float, whatever dtype read_csv gave the column (int64 for a file or chunk of whole numbers only),
+        # so "1035.0" is written alike by whole files and by chunks
+        df['Square_Footage'] = pd.to_numeric(df['Square_Footage'].apply(DataCleaner.clean_square_footage))
+        df['Posted_Date'] = DataCleaner.clean_posted_dates(df['Posted_Date'], self.run_started, self.posted_dates)
+        df['House_Price'] = DataCleaner.normalize_house_price(df['House_Price'], df['House_Type'])
         df = df[df['House_Price'] >= 25000] # Remove all rows with price below 25000 due to fake sales price
 
         # df['Price_Square_Feet'] = df['Price_Square_Feet'].str.extract(r'rm (\d+\.\d+)')
@@ -231,69 +304,140 @@ class DataTransformer:
         df.loc[:, 'Square_Footage'] = df['Square_Footage'].fillna(0)
 
         columns_to_clean = ['Agent_Name', 'House_Name', 'House_Location', 'House_Type', 'Lot_Type', 'House_Furniture', 'Area']
-        for col in columns_to_clean:
-            df[col] = df[col].apply(DataCleaner.clean_and_capitalize).astype('str')
-
-        replacements = {
-            r'\bHomes\b': 'House',
-            r'\bSty\b': 'Storey',
-            r'\blink\b': 'Link'
-        }
         columns_to_clean2 = ['House_Type']
-        # Apply the replacements to each column
-        for col in columns_to_clean2:
-            df[col] = df[col].replace(replacements, regex=True)
+        for col in columns_to_clean:
+            # Cleaned once per distinct value, the replacements included
+            df[col] = DataCleaner.clean_text_column(df[col], self.REPLACEMENTS if col in columns_to_clean2 else None)
 
         state = ' '.join(re.findall(r'batch\d+_\d+_([^_]+)_iproperty_\d+_\d+.csv', file_name)[0].replace('-', ' ').split()).title()
         df.insert(loc=3, column='State', value=state)
         return df
 
 class DataProcessor:
+    # Column order of staging_data.csv
+    COLUMNS = ['Property_ID', 'Page_Link', 'Source', 'Agent_Name', 'State', 'Area', 'House_Price', 'Price_Square_Feet', 'House_Name', 'House_Location', 'House_Type', 'Lot_Type', 'Square_Footage', 'House_Furniture', 'Posted_Date', 'Created_At']
+    # Read as text when streaming, even in a chunk where they happen to be empty: transform_data uses .str on them
+    TEXT_COLUMNS = {'Page_Link': object, 'House_Price': object}
+    # The same Posted_Date text in every chunk and file; one whose dates all fall at midnight would otherwise get dates only
+    DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
     def __init__(self, config):
         self.config = config
         self.schema = SchemaHandler.read_schema(os.path.join(config.schema_dir, 'mssql_iproperty.json'))
         self.transformer = DataTransformer(self.schema)
 
+    def transform_frame(self, df, file_name):
+        df = df[df['Page_Link'].notna() & (df['Page_Link'] != '')]
+        transformed_df = self.transformer.transform_data(df, file_name)
+        transformed_df = transformed_df.map(DataCleaner.replace_start_nan)
+        transformed_df = SchemaHandler.handle_numerical_nan(transformed_df, self.schema)
+        return self.reorganize_columns(transformed_df)  # Reorganize columns
+
+    def transform_file(self, csv_file):
+        """Transformed frame of one raw CSV (None when there is nothing to keep), its rows and the seconds it took."""
+        start_time = time.perf_counter()
+        try:
+            df = pd.read_csv(csv_file)
+            if df.empty:
+                print(f"Skipping empty file: {csv_file}")
+                return None, 0, time.perf_counter() - start_time
+            transformed_df = self.transform_frame(df, os.path.basename(csv_file))
+            return transformed_df, len(transformed_df), time.perf_counter() - start_time
+        except pd.errors.EmptyDataError:
+            print(f"No data to parse in file: {csv_file}")
+        except Exception as e:
+            print(f"Error processing file {csv_file}: {e}")
+        return None, 0, time.perf_counter() - start_time
+
+    def part_file(self, csv_file):
+        return os.path.join(self.config.staging_dir, f"{os.path.basename(csv_file)}.part")
+
+    def stream_file(self, csv_file):
+        """Transform one raw CSV TRANSFORM_CHUNK_ROWS rows at a time into its part file; None, its rows and the seconds it took."""
+        start_time = time.perf_counter()
+        part_file = self.part_file(csv_file)
+        if os.path.exists(part_file):
+            os.remove(part_file)  # left behind by an interrupted run
+        rows = 0
+        try:
+            with pd.read_csv(csv_file, chunksize=self.config.transform_chunk_rows, dtype=self.TEXT_COLUMNS) as chunks:
+                for chunk in chunks:
+                    transformed_df = self.transform_frame(chunk, os.path.basename(csv_file))
+                    if not transformed_df.empty:
+                        transformed_df.to_csv(part_file, mode='a', header=False, index=False, date_format=self.DATE_FORMAT)
+                        rows += len(transformed_df)
+            if rows == 0:
+                print(f"Skipping empty file: {csv_file}")
+            return None, rows, time.perf_counter() - start_time
+        except pd.errors.EmptyDataError:
+            print(f"No data to parse in file: {csv_file}")
+        except Exception as e:
+            print(f"Error processing file {csv_file}: {e}")
+        if os.path.exists(part_file):
+            os.remove(part_file)  # a file that fails is left out entirely, as when it is read whole
+        return None, 0, time.perf_counter() - start_time
+
+    def map_files(self, transform, csv_files):
+        """(csv_file, transform(csv_file)) in file order, TRANSFORM_WORKERS files at a time in worker processes."""
+        workers = max(1, min(self.config.transform_workers, len(csv_files)))
+        start_time = time.perf_counter()
+        # Every worker gets a copy of this processor, so all files share the transformer's run_started
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            if pool:
+                # Largest files first so a big region does not start last, results still kept in file order
+                futures = {csv_file: pool.submit(transform, csv_file) for csv_file in sorted(csv_files, key=os.path.getsize, reverse=True)}
+                results = (futures[csv_file].result() for csv_file in csv_files)
+            else:
+                results = map(transform, csv_files)
+            for csv_file, (transformed_df, rows, seconds) in zip(csv_files, results):
+                print(f"Transformed {os.path.basename(csv_file)}: {rows} rows in {seconds:.2f} seconds")
+                yield csv_file, transformed_df
+        finally:
+            if pool:
+                pool.shutdown()
+        print(f"Transformed {len(csv_files)} files with {workers} workers in {time.perf_counter() - start_time:.2f} seconds.")
+
     def process_files(self):
-        transformed_data = []
-        for csv_file in self.config.csv_files:
-            try:
-                df = pd.read_csv(csv_file)
-                if df.empty:
-                    print(f"Skipping empty file: {csv_file}")
-                    continue
-                df = df[df['Page_Link'].notna() & (df['Page_Link'] != '')]
-                file_name = os.path.basename(csv_file)
-                transformed_df = self.transformer.transform_data(df, file_name)
-                transformed_df = transformed_df.map(DataCleaner.replace_start_nan)
-                transformed_df = SchemaHandler.handle_numerical_nan(transformed_df, self.schema)
-                transformed_df = self.reorganize_columns(transformed_df)  # Reorganize columns
-                transformed_data.append(transformed_df)
-            except pd.errors.EmptyDataError:
-                print(f"No data to parse in file: {csv_file}")
-            except Exception as e:
-                print(f"Error processing file {csv_file}: {e}")
+        transformed_data = [transformed_df for _, transformed_df in self.map_files(self.transform_file, self.config.csv_files) if transformed_df is not None]
         return pd.concat(transformed_data) if transformed_data else pd.DataFrame()
 
-    def reorganize_columns(self, df):
-        # Define the new order of columns
-        new_order = ['Property_ID', 'Page_Link', 'Source', 'Agent_Name', 'State', 'Area', 'House_Price', 'Price_Square_Feet', 'House_Name', 'House_Location', 'House_Type', 'Lot_Type', 'Square_Footage', 'House_Furniture', 'Posted_Date', 'Created_At']
+    def stream_files(self, staging_file):
+        """Write staging_data.csv chunk by chunk: each file goes to its own part file, then the parts are joined in file order."""
+        part_files = [self.part_file(csv_file) for csv_file, _ in self.map_files(self.stream_file, self.config.csv_files)]
+        part_files = [part_file for part_file in part_files if os.path.exists(part_file)]
+        if not part_files:
+            return False
+        pd.DataFrame(columns=self.COLUMNS).to_csv(staging_file, index=False)  # header only
+        with open(staging_file, 'ab') as staging:
+            for part_file in part_files:
+                with open(part_file, 'rb') as part:
+                    shutil.copyfileobj(part, staging)
+                os.remove(part_file)
+        return True
 
+    def reorganize_columns(self, df):
         # Reorganize columns and handle any missing columns
-        df = df.reindex(columns=new_order, fill_value=None)
+        df = df.reindex(columns=self.COLUMNS, fill_value=None)
         return df
 
     def save_transformed_data(self):
+        staging_file = os.path.join(self.config.staging_dir, 'staging_data.csv')
+        if self.config.transform_chunk_rows:
+            # Bounded memory: TRANSFORM_CHUNK_ROWS rows per worker, whatever the size of the raw files
+            if not self.stream_files(staging_file):
+                print("No data was processed. Check the input files.")
+            return
         data = self.process_files()
         if not data.empty:
-            staging_file = os.path.join(self.config.staging_dir, 'staging_data.csv')
-            data.to_csv(staging_file, index=False)
+            data.to_csv(staging_file, index=False, date_format=self.DATE_FORMAT)
         else:
             print("No data was processed. Check the input files.")
 
 # Main
-config = Config()
-config.create_folders()
-processor = DataProcessor(config)
-processor.save_transformed_data()
-sys.exit(0)
+if __name__ == "__main__":
+    config = Config()
+    config.create_folders()
+    processor = DataProcessor(config)
+    processor.save_transformed_data()
+    sys.exit(0)